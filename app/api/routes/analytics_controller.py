@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy import func, desc, and_, or_, literal
 from datetime import datetime, timedelta
 from typing import List, Optional
 import re
@@ -1929,12 +1929,12 @@ async def get_unanswered_questions(
     # 2. Thực hiện Query với select_from để xác định bảng gốc
     query = (
         db.query(
-            entities.FaqStatistics.faq_id,
+            UserMsg.session_id.label("session_id"),
             UserMsg.interaction_id.label("question_id"),
             UserMsg.message_text.label("question_text"),
-            UserMsg.session_id.label("session_id"),
+            func.coalesce(func.nullif(BotMsg.message_text, ""), "Bot không có phản hồi").label("bot_response"),
             UserMsg.timestamp.label("timestamp"),
-            BotMsg.message_text.label("bot_response")
+            literal("Hệ thống không nhận diện được ý định").label("fail_reason")
         )
         .select_from(entities.FaqStatistics) # Ép FaqStatistics nằm ở mệnh đề FROM đầu tiên
         .join(
@@ -1950,19 +1950,8 @@ async def get_unanswered_questions(
         .limit(limit)
     )
 
-    results = query.all()
-
-    # 3. Format dữ liệu trả về
-    failed_questions = []
-    for row in results:
-        failed_questions.append({
-            "session_id": row.session_id,
-            "question_id": row.question_id,
-            "question_text": row.question_text,
-            "bot_response": row.bot_response if row.bot_response else "Bot không có phản hồi",
-            "timestamp": row.timestamp,
-            "fail_reason": "Hệ thống không nhận diện được ý định"
-        })
+    # 3. Rows đã đúng format trả về (default bot_response/fail_reason tính trong SQL)
+    failed_questions = [row._asdict() for row in query.all()]
 
     return {
         "total_failed": len(failed_questions),
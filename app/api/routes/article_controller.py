@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from app.models.database import get_db
 from app.models.schemas import (
@@ -8,19 +8,214 @@ from app.models.schemas import (
 from app.models.entities import Article, Users, Major, Specialization
 from typing import List, Optional
 from app.core.security import (
-    get_current_user, verify_content_manager,
-    verify_content_manager_leader, is_admin, has_permission
+    get_current_user_claims, verify_content_manager,
+    verify_content_manager_leader, has_permission, is_content_role
 )
-from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, select, insert, update, exists, tuple_
 from fastapi import Form, File, UploadFile
-from app.core.cloudinary import upload_image_file
+from fastapi.responses import ORJSONResponse, Response
+from app.core.cloudinary import upload_image_file, upload_image_files
+from cachetools import TTLCache
+from threading import Lock
+import base64
+import hashlib
+from datetime import date
+import orjson
+
+# orjson for every response: list/detail bodies are already plain rows, dumped without Pydantic
+router = APIRouter(default_response_class=ORJSONResponse)
+
+def article_list_query():
+    """
+    Lean statement for list views: select only the columns ArticleResponse needs,
+    with author/major/specialization names joined in the same SQL statement.
+    Rows come back as lightweight tuples instead of full Article objects.
+    """
+    return (
+        select(
+            Article.article_id,
+            Article.title,
+            Article.description,
+            Article.url,
+            Article.link_image,
+            Article.note,
+            Article.status,
+            Article.create_at,
+            Article.created_by,
+            Article.major_id,
+            Article.specialization_id,
+            Users.full_name.label("author_name"),
+            Major.major_name.label("major_name"),
+            Specialization.specialization_name.label("specialization_name"),
+        )
+        .outerjoin(Users, Users.user_id == Article.created_by)
+        .outerjoin(Major, Major.major_id == Article.major_id)
+        .outerjoin(Specialization, Specialization.specialization_id == Article.specialization_id)
+    )
+
+def encode_cursor(row) -> str:
+    """Opaque keyset cursor for the last row of a page: (create_at, article_id)."""
+    raw = f"{row.create_at.isoformat()}|{row.article_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        create_at, article_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(create_at), int(article_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def paginate(stmt, limit: int, offset: int, after: Optional[str] = None):
+    """
+    Newest first, bounded to one page so list responses don't grow with the table.
+    With a cursor (`after`, from the X-Next-Cursor header of the previous page) the
+    page starts right after that row via an index range instead of skipping `offset` rows.
+    """
+    if after:
+        stmt = stmt.where(tuple_(Article.create_at, Article.article_id) < decode_cursor(after))
+    return (
+        stmt.order_by(Article.create_at.desc(), Article.article_id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+def fetch_article_page(db: Session, criteria, limit: int, offset: int, after: Optional[str] = None):
+    """
+    The one query path behind every article list endpoint: article_list_query filtered
+    by `criteria`, paginated. SQLAlchemy's statement cache ignores literal values, so
+    e.g. the published listing and the draft review queue share one compiled statement.
+    """
+    return db.execute(paginate(article_list_query().where(*criteria), limit, offset, after)).all()
+
+def next_cursor(rows, limit: int) -> Optional[str]:
+    """Cursor for the following page, or None when this page is the last one."""
+    if len(rows) < limit or rows[-1].create_at is None:
+        return None
+    return encode_cursor(rows[-1])
+
+def serialize_articles(rows) -> bytes:
+    """
+    Shared list serialization for article_list_query rows.
+    The projected columns are exactly the ArticleResponse fields, so each row is
+    dumped as-is with orjson (no ORM objects, no per-row Pydantic validation).
+    """
+    return orjson.dumps([row._asdict() for row in rows])
+
+def article_response(db: Session, article_id: int) -> ORJSONResponse:
+    """
+    Single-article counterpart of serialize_articles, shared by every endpoint that
+    returns one ArticleResponse: one joined SELECT through article_list_query instead
+    of refresh() plus lazy loads of author/major/specialization.
+    """
+    row = db.execute(article_list_query().where(Article.article_id == article_id)).one()
+    return ORJSONResponse(row._asdict())
+
+def body_etag(body: bytes) -> str:
+    """Weak validator for a serialized list body."""
+    return 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+def conditional_response(
+    request: Request, body: bytes, etag: Optional[str] = None, cursor: Optional[str] = None
+) -> Response:
+    """
+    Send the body with its ETag, or an empty 304 when the client already holds it
+    (If-None-Match matches), so unchanged listings are not re-transmitted.
+    The next-page cursor, if any, goes in X-Next-Cursor.
+    """
+    etag = etag or body_etag(body)
+    headers = {"ETag": etag}
+    if cursor:
+        headers["X-Next-Cursor"] = cursor
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def list_response(request: Request, rows, limit: int) -> Response:
+    """Serialized page of article_list_query rows with ETag and next-page cursor."""
+    return conditional_response(request, serialize_articles(rows), cursor=next_cursor(rows, limit))
+
+# Serialized published-only listings keyed on (limit, offset, after). Every anonymous visitor
+# (and every user without content permissions) gets the same rows, so the body and its
+# ETag are reused.
+# Kept in-process: the backend runs as a single gunicorn worker (see docker-compose.yaml).
+_published_articles_cache = TTLCache(maxsize=256, ttl=60)
+_published_articles_lock = Lock()
+
+def invalidate_published_articles(*statuses: Optional[str]):
+    """
+    Drop cached published listings after a write. Pass the article's status
+    before/after the write; the cache is only cleared if one of them is published.
+    """
+    if statuses and "published" not in statuses:
+        return
+    with _published_articles_lock:
+        _published_articles_cache.clear()
 
-router = APIRouter()
+def can_edit_article(user, created_by: Optional[int]) -> bool:
+    """
+    Ownership rule for update/delete: authors manage their own articles, admins and
+    content manager leaders manage any (cheap id comparison first).
+    """
+    return created_by == user.user_id or verify_content_manager_leader(user)
+
+def update_article_returning_status(db: Session, article_id: int, values: dict, *criteria) -> Optional[str]:
+    """
+    UPDATE the article in place and return its status from *before* the update
+    (needed for cache invalidation), or None if no row matched article_id/criteria.
+    The pre-update status comes from a snapshot subquery joined in the UPDATE ... FROM.
+    """
+    old = (
+        select(Article.article_id, Article.status.label("previous_status"))
+        .where(Article.article_id == article_id)
+        .subquery()
+    )
+    return db.execute(
+        update(Article)
+        .where(Article.article_id == old.c.article_id, *criteria)
+        .values(**values)
+        .returning(old.c.previous_status)
+    ).scalar_one_or_none()
+
+# Ids already confirmed to exist. Majors/Specializations are reference data that the
+# API never deletes, so only positive results are cached (a new id is never a stale 404).
+_known_major_ids = TTLCache(maxsize=1024, ttl=300)
+_known_specialization_ids = TTLCache(maxsize=4096, ttl=300)
+_known_ids_lock = Lock()
+
+def validate_major_and_specialization(db: Session, major_id: Optional[int], specialization_id: Optional[int]):
+    """
+    Check that the given Major/Specialization ids exist (None = not provided).
+    Ids seen recently are answered from memory; the rest are checked with one
+    SELECT with two EXISTS subqueries instead of two round trips.
+    """
+    with _known_ids_lock:
+        check_major = major_id is not None and major_id not in _known_major_ids
+        check_spec = specialization_id is not None and specialization_id not in _known_specialization_ids
+    if not (check_major or check_spec):
+        return
+
+    # Only the ids that still need checking go into the statement
+    checks = []
+    if check_major:
+        checks.append(exists().where(Major.major_id == major_id).label("maj"))
+    if check_spec:
+        checks.append(exists().where(Specialization.specialization_id == specialization_id).label("spec"))
+    row = db.execute(select(*checks)).one()._mapping
+
+    if check_major and not row["maj"]:
+        raise HTTPException(status_code=404, detail=f"Major {major_id} not found")
+    if check_spec and not row["spec"]:
+        raise HTTPException(status_code=404, detail=f"Specialization {specialization_id} not found")
+
+    with _known_ids_lock:
+        if check_major:
+            _known_major_ids[major_id] = True
+        if check_spec:
+            _known_specialization_ids[specialization_id] = True
 
 # --- CREATE ARTICLE ---
 @router.post("", response_model=ArticleResponse)
-async def create_article(
+def create_article(
     # Thay vì article: ArticleCreate, ta dùng Form và File
     title: str = Form(...),
     description: str = Form(...),
@@ -30,7 +225,7 @@ async def create_article(
     specialization_id: Optional[int] = Form(None),
     image: UploadFile = File(...), # Bắt buộc phải có ảnh khi tạo mới
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user)
+    current_user: Users = Depends(get_current_user_claims)
 ):
     """
     Create a new article with Image Upload to Cloudinary.
@@ -41,47 +236,102 @@ async def create_article(
             detail="Only content managers can create articles"
         )
 
-    # 1. Validate Major/Specialization (Giữ nguyên logic cũ)
-    if major_id:
-        major = db.query(Major).filter(Major.major_id == major_id).first()
-        if not major:
-            raise HTTPException(status_code=404, detail=f"Major {major_id} not found")
-
-    if specialization_id:
-        spec = db.query(Specialization).filter(Specialization.specialization_id == specialization_id).first()
-        if not spec:
-            raise HTTPException(status_code=404, detail=f"Specialization {specialization_id} not found")
-
-    # 2. Upload ảnh lên Cloudinary
-    # Validate đuôi file nếu cần
+    # 1. Validate đuôi file trước (không tốn round trip nào)
     if not image.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
-    
+
+    # 2. Validate Major/Specialization (tối đa 1 round trip)
+    validate_major_and_specialization(db, major_id or None, specialization_id or None)
+
+    # Upload ảnh lên Cloudinary
     image_url = upload_image_file(image)
 
     # 3. Lưu vào DB
-    new_article = Article(
-        title=title,
-        description=description,
-        url=url,
-        link_image=image_url, # Lưu URL trả về từ Cloudinary
-        note=note,
-        status="draft",
-        create_at=datetime.now(),
-        created_by=current_user.user_id,
-        major_id=major_id,
-        specialization_id=specialization_id
-    )
+    # INSERT ... RETURNING article_id: no ORM unit of work, no reload of defaults
+    article_id = db.execute(
+        insert(Article)
+        .values(
+            title=title,
+            description=description,
+            url=url,
+            link_image=image_url, # Lưu URL trả về từ Cloudinary
+            note=note,
+            status="draft",
+            created_by=current_user.user_id,
+            major_id=major_id,
+            specialization_id=specialization_id
+        )
+        .returning(Article.article_id)
+    ).scalar_one()
+    db.commit()
+
+    return article_response(db, article_id)
+
+# --- BULK CREATE ARTICLES ---
+BULK_CREATE_LIMIT = 50
+
+@router.post("/bulk", response_model=List[ArticleResponse])
+def create_articles_bulk(
+    # Các danh sách cùng độ dài: phần tử thứ i của mỗi danh sách thuộc về bài viết thứ i
+    titles: List[str] = Form(...),
+    descriptions: List[str] = Form(...),
+    images: List[UploadFile] = File(...),
+    major_id: Optional[int] = Form(None),
+    specialization_id: Optional[int] = Form(None),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user_claims)
+):
+    """
+    Create several draft articles at once (bulk import). All images are checked before
+    anything is uploaded, then uploaded to Cloudinary concurrently, and the articles are
+    inserted with one multi-row INSERT. major_id/specialization_id apply to every article.
+    """
+    if not current_user or not verify_content_manager(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only content managers can create articles"
+        )
+
+    if not (len(titles) == len(descriptions) == len(images)):
+        raise HTTPException(status_code=400, detail="titles, descriptions and images must have the same length")
+    if len(images) > BULK_CREATE_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_CREATE_LIMIT} articles per request")
 
-    db.add(new_article)
+    # Validate tất cả trước khi upload ảnh nào
+    if any(not image.content_type.startswith('image/') for image in images):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    validate_major_and_specialization(db, major_id or None, specialization_id or None)
+
+    image_urls = upload_image_files(images)
+
+    article_ids = db.execute(
+        insert(Article)
+        .values([
+            dict(
+                title=title,
+                description=description,
+                link_image=image_url,
+                status="draft",
+                created_by=current_user.user_id,
+                major_id=major_id,
+                specialization_id=specialization_id
+            )
+            for title, description, image_url in zip(titles, descriptions, image_urls)
+        ])
+        .returning(Article.article_id)
+    ).scalars().all()
     db.commit()
-    db.refresh(new_article)
 
-    return new_article
+    rows = db.execute(
+        article_list_query()
+        .where(Article.article_id.in_(article_ids))
+        .order_by(Article.article_id)
+    ).all()
+    return ORJSONResponse([row._asdict() for row in rows])
 
 # --- UPDATE ARTICLE ---
 @router.put("/{article_id}", response_model=ArticleResponse)
-async def update_article(
+def update_article(
     article_id: int,
     # Các trường update đều là Optional
     title: Optional[str] = Form(None),
@@ -92,7 +342,7 @@ async def update_article(
     specialization_id: Optional[int] = Form(None),
     image: UploadFile | None = File(default=None), # Ảnh là tùy chọn khi update
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user)
+    current_user: Users = Depends(get_current_user_claims)
 ):
     """
     Update article. If 'image' is provided, upload new image. If not, keep old image.
@@ -100,25 +350,24 @@ async def update_article(
     if not current_user or not verify_content_manager(current_user):
         raise HTTPException(status_code=403, detail="Only content managers can update articles")
 
-    article = db.query(Article).filter(Article.article_id == article_id).first()
+    article = db.get(Article, article_id)
     if not article:
         raise HTTPException(status_code=404, detail=f"Article {article_id} not found")
 
     # Check permissions logic (Giữ nguyên)
-    is_admin_user = is_admin(current_user)
-    is_leader = verify_content_manager_leader(current_user)
-    if not (is_admin_user or is_leader) and article.created_by != current_user.user_id:
+    if not can_edit_article(current_user, article.created_by):
         raise HTTPException(status_code=403, detail="You can only edit your own articles")
 
-    # Validate Major/Spec (Giữ nguyên)
+    # Validate Major/Spec (tối đa 1 round trip); ids the article already points at
+    # were valid when stored, so a form that resends them needs no check
+    validate_major_and_specialization(
+        db,
+        major_id if major_id != article.major_id else None,
+        specialization_id if specialization_id != article.specialization_id else None,
+    )
     if major_id is not None:
-        if not db.query(Major).filter(Major.major_id == major_id).first():
-             raise HTTPException(status_code=404, detail=f"Major {major_id} not found")
         article.major_id = major_id
-
     if specialization_id is not None:
-        if not db.query(Specialization).filter(Specialization.specialization_id == specialization_id).first():
-            raise HTTPException(status_code=404, detail=f"Specialization {specialization_id} not found")
         article.specialization_id = specialization_id
 
     # Update Text Fields
@@ -138,45 +387,50 @@ async def update_article(
     
     # Nếu image là None, giữ nguyên article.link_image cũ
 
+    current_status = article.status
     db.commit()
-    db.refresh(article)
-    return article
+    invalidate_published_articles(current_status)
+    return article_response(db, article_id)
 
 @router.put("/{article_id}/status", response_model=ArticleResponse)
-async def update_article_status(
+def update_article_status(
     article_id: int,
     status_update: ArticleStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user)
+    current_user: Users = Depends(get_current_user_claims)
 ):
     """
     Update article status (Content Manager Leader only)
     """
-    if not current_user or not (verify_content_manager_leader(current_user) or is_admin(current_user)):
+    # verify_content_manager_leader already lets admins through
+    if not verify_content_manager_leader(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only content manager leaders or admins can update article status"
         )
 
-    article = db.query(Article).filter(Article.article_id == article_id).first()
-    if not article:
+    # Update status: one UPDATE ... RETURNING instead of SELECT + flush
+    previous_status = update_article_returning_status(
+        db, article_id, {"status": status_update.status, "note": status_update.note}
+    )
+    if previous_status is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Article with id {article_id} not found"
         )
-
-    # Update status
-    article.status = status_update.status
-    article.note = status_update.note
     db.commit()
-    db.refresh(article)
+    invalidate_published_articles(previous_status, status_update.status)
 
-    return article
+    return article_response(db, article_id)
 
 @router.get("", response_model=List[ArticleResponse])
-async def get_articles(
+def get_articles(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
-    current_user: Optional[Users] = Depends(get_current_user)
+    current_user: Optional[Users] = Depends(get_current_user_claims)
 ):
     """
     Get articles based on user permissions:
@@ -184,69 +438,36 @@ async def get_articles(
     - Content manager: can see their own articles (any status except deleted) + all published articles
     - Other users: can only see published articles
     """
-    # Base query with joins for additional information
-    query = (
-        db.query(Article)
-        .filter(Article.status != "deleted")  # Exclude deleted articles for all users
-        .outerjoin(Major)
-        .outerjoin(Specialization)
-        .outerjoin(Users, Users.user_id == Article.created_by)
-    )
-
-    # Apply filters based on permissions
-    if not current_user:
-        # Not authenticated: only published articles
-        query = query.filter(Article.status == "published")
-    elif is_admin(current_user):
-        # Admin: can see all articles (already filtered deleted above)
-        pass
-    elif (
-        has_permission(current_user, "content_manager")
-        or has_permission(current_user, "content manager")
-        or (
-            current_user
-            and current_user.permissions
-            and any(
-                (p.permission_name and "content" in p.permission_name.lower())
-                for p in current_user.permissions
-            )
-        )
-    ):
-        # Content manager: can see all articles (already filtered deleted above)
-        pass
-    else:
-        # Other users: only published articles
-        query = query.filter(Article.status == "published")
-
-    articles = query.all()
-
-    # Format response with additional information
-    response = []
-    for article in articles:
-        article_data = ArticleResponse(
-            article_id=article.article_id,
-            title=article.title,
-            description=article.description,
-            url=article.url,
-            link_image=article.link_image,
-            status=article.status,
-            create_at=article.create_at,
-            created_by=article.created_by,
-            major_id=article.major_id,
-            specialization_id=article.specialization_id,
-            author_name=article.author_user.full_name if article.author_user else None,
-            major_name=article.major.major_name if article.major else None,
-            specialization_name=article.specialization.specialization_name if article.specialization else None,
-            note=article.note if article.note else None
-        )
-        response.append(article_data)
-
-    return response
+    # Admins and content roles see every non-deleted article; everyone else,
+    # including anonymous visitors, only published ones
+    published_only = not is_content_role(current_user)
+
+    if not published_only:
+        # Exclude deleted articles for all users
+        articles = fetch_article_page(db, (Article.status != "deleted",), limit, offset, after)
+        return list_response(request, articles, limit)
+
+    cache_key = (limit, offset, after)
+    with _published_articles_lock:
+        cached = _published_articles_cache.get(cache_key)
+    if cached is None:
+        articles = fetch_article_page(db, (Article.status == "published",), limit, offset, after)
+        body = serialize_articles(articles)
+        cached = (body, body_etag(body), next_cursor(articles, limit))
+        with _published_articles_lock:
+            _published_articles_cache[cache_key] = cached
+
+    body, etag, cursor = cached
+    return conditional_response(request, body, etag, cursor)
 
 @router.get("/review", response_model=List[ArticleResponse])
-async def get_draft_articles_for_review(
+def get_draft_articles_for_review(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user)
+    current_user: Users = Depends(get_current_user_claims)
 ):
     """
     Get all articles with 'draft' status for review.
@@ -259,53 +480,22 @@ async def get_draft_articles_for_review(
         )
 
     # Check for admin or content manager leader permissions
-    is_admin_user = is_admin(current_user)
-    is_leader = verify_content_manager_leader(current_user)
-
-    if not (is_admin_user or is_leader):
+    if not verify_content_manager_leader(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only Admins or Content Manager Leaders can review articles"
         )
 
     # Query for draft articles
-    draft_articles = (
-        db.query(Article)
-        .filter(Article.status == "draft")
-        .outerjoin(Users, Users.user_id == Article.created_by)
-        .outerjoin(Major)
-        .outerjoin(Specialization)
-        .all()
-    )
-
-    # Format response
-    response = []
-    for article in draft_articles:
-        article_data = ArticleResponse(
-            article_id=article.article_id,
-            title=article.title,
-            description=article.description,
-            url=article.url,
-            link_image=article.link_image,
-            status=article.status,
-            create_at=article.create_at,
-            created_by=article.created_by,
-            major_id=article.major_id,
-            specialization_id=article.specialization_id,
-            author_name=article.author_user.full_name if article.author_user else None,
-            major_name=article.major.major_name if article.major else None,
-            specialization_name=article.specialization.specialization_name if article.specialization else None,
-            note=article.note if article.note else None
-        )
-        response.append(article_data)
+    draft_articles = fetch_article_page(db, (Article.status == "draft",), limit, offset, after)
 
-    return response
+    return list_response(request, draft_articles, limit)
 
 @router.get("/{article_id}", response_model=ArticleResponse)
-async def get_article(
+def get_article(
     article_id: int,
     db: Session = Depends(get_db),
-    current_user: Optional[Users] = Depends(get_current_user)
+    current_user: Optional[Users] = Depends(get_current_user_claims)
 ):
     """
     Get a specific article based on user permissions:
@@ -314,14 +504,9 @@ async def get_article(
     - Content manager author: can see their own articles (any status)
     - Other users: can only see published articles
     """
-    article = (
-        db.query(Article)
-        .outerjoin(Major)
-        .outerjoin(Specialization)
-        .outerjoin(Users, Users.user_id == Article.created_by)
-        .filter(Article.article_id == article_id)
-        .first()
-    )
+    article = db.execute(
+        article_list_query().where(Article.article_id == article_id)
+    ).one_or_none()
 
     if not article:
         raise HTTPException(
@@ -329,61 +514,22 @@ async def get_article(
             detail=f"Article with id {article_id} not found"
         )
 
-    # Check access permission
-    can_view = False
-    
-    if not current_user:
-        # Not authenticated: only published articles
-        can_view = article.status == "published"
-    elif is_admin(current_user):
-        # Admin: can view any article
-        can_view = True
-    elif (
-        has_permission(current_user, "content_manager")
-        or has_permission(current_user, "content manager")
-        or (
-            current_user
-            and current_user.permissions
-            and any(
-                (p.permission_name and "content" in p.permission_name.lower())
-                for p in current_user.permissions
-            )
-        )
-    ):
-        # Content manager: can view any article (any status)
-        can_view = True
-    else:
-        # Other users: only published articles
-        can_view = article.status == "published"
-    
+    # Published articles are public; anything else needs admin or a content role
+    can_view = article.status == "published" or is_content_role(current_user)
+
     if not can_view:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to view this article"
         )
 
-    return ArticleResponse(
-        article_id=article.article_id,
-        title=article.title,
-        description=article.description,
-        url=article.url,
-        link_image=article.link_image,
-        status=article.status,
-        create_at=article.create_at,
-        created_by=article.created_by,
-        major_id=article.major_id,
-        specialization_id=article.specialization_id,
-        author_name=article.author_user.full_name if article.author_user else None,
-        major_name=article.major.major_name if article.major else None,
-        specialization_name=article.specialization.specialization_name if article.specialization else None,
-        note=article.note if article.note else None
-    )
+    return ORJSONResponse(article._asdict())
 
 @router.delete("/{article_id}", response_model=ArticleResponse)
-async def delete_article(
+def delete_article(
     article_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user)
+    current_user: Users = Depends(get_current_user_claims)
 ):
     """
     Soft delete an article by changing its status to 'deleted'.
@@ -396,43 +542,50 @@ async def delete_article(
             detail="Only content managers can delete articles"
         )
 
-    # Get the article
-    article = db.query(Article).filter(Article.article_id == article_id).first()
-    if not article:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Article with id {article_id} not found"
-        )
+    # Soft delete: change status to 'deleted' in a single UPDATE ... RETURNING.
+    # Admin/Leader can delete any, regular CM can only delete their own.
+    criteria = [Article.status != "deleted"]
+    if not verify_content_manager_leader(current_user):
+        criteria.append(Article.created_by == current_user.user_id)
+    previous_status = update_article_returning_status(db, article_id, {"status": "deleted"}, *criteria)
+
+    if previous_status is None:
+        # Nothing updated: look the row up only to report why
+        article = db.execute(
+            select(Article.status).where(Article.article_id == article_id)
+        ).first()
+        if not article:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Article with id {article_id} not found"
+            )
 
-    # Check if already deleted
-    if article.status == "deleted":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Article is already deleted"
-        )
+        # Check if already deleted
+        if article.status == "deleted":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Article is already deleted"
+            )
 
-    # Check permissions: Admin/Leader can delete any, regular CM can only delete their own
-    is_admin_user = is_admin(current_user)
-    is_leader = verify_content_manager_leader(current_user)
-    
-    if not (is_admin_user or is_leader) and article.created_by != current_user.user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only delete your own articles"
         )
 
-    # Soft delete: change status to 'deleted'
-    article.status = "deleted"
     db.commit()
-    db.refresh(article)
+    invalidate_published_articles(previous_status)
 
-    return article
+    return article_response(db, article_id)
 
 @router.get("/users/{user_id}", response_model=List[ArticleResponse])
-async def get_articles_by_user(
+def get_articles_by_user(
     user_id: int,
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user)
+    current_user: Users = Depends(get_current_user_claims)
 ):
     """
     Get all articles created by a specific user.
@@ -445,24 +598,21 @@ async def get_articles_by_user(
             detail="Authentication required"
         )
 
-    # Check for admin or content manager leader permissions
-    is_admin_user = is_admin(current_user)
-    is_leader = verify_content_manager_leader(current_user)
-    is_content_manager = has_permission(current_user, "Content Manager")
-    
     # Allow if:
     # 1. User is Admin or Content Manager Leader (can view any user's articles)
     # 2. User is Content Manager viewing their own articles
+    # Cheapest checks first; later ones are skipped once the outcome is known.
     is_viewing_own_articles = (current_user.user_id == user_id)
-    
-    if not (is_admin_user or is_leader or (is_content_manager and is_viewing_own_articles)):
+
+    if not (verify_content_manager_leader(current_user)
+            or (is_viewing_own_articles and has_permission(current_user, "Content Manager"))):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to view articles by this user"
         )
     
     # Check if the target user exists
-    target_user = db.query(Users).filter(Users.user_id == user_id).first()
+    target_user = db.get(Users, user_id)
     if not target_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -470,35 +620,8 @@ async def get_articles_by_user(
         )
 
     # Query for articles by the specified user (exclude deleted)
-    user_articles = (
-        db.query(Article)
-        .filter(Article.created_by == user_id)
-        .filter(Article.status != "deleted")
-        .outerjoin(Users, Users.user_id == Article.created_by)
-        .outerjoin(Major)
-        .outerjoin(Specialization)
-        .all()
+    user_articles = fetch_article_page(
+        db, (Article.created_by == user_id, Article.status != "deleted"), limit, offset, after
     )
 
-    # Format response
-    response = []
-    for article in user_articles:
-        article_data = ArticleResponse(
-            article_id=article.article_id,
-            title=article.title,
-            description=article.description,
-            url=article.url,
-            link_image=article.link_image,
-            status=article.status,
-            create_at=article.create_at,
-            created_by=article.created_by,
-            major_id=article.major_id,
-            specialization_id=article.specialization_id,
-            author_name=article.author_user.full_name if article.author_user else None,
-            major_name=article.major.major_name if article.major else None,
-            specialization_name=article.specialization.specialization_name if article.specialization else None,
-            note=article.note if article.note else None
-        )
-        response.append(article_data)
-
-    return response
+    return list_response(request, user_articles, limit)
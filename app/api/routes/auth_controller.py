@@ -1,15 +1,21 @@
 from datetime import timedelta
+import hashlib
+import hmac
+from threading import Lock
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from cachetools import TTLCache
 
 from app.core.security import (
     create_access_token,
+    build_token_claims,
     get_password_hash,
     verify_password,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     get_current_user,
     verify_user_access,
+    SECRET_KEY,
 )
 from app.models.database import get_db
 from app.models.schemas import (
@@ -18,24 +24,82 @@ from app.models.schemas import (
     UserResponse,
     LoginRequest,
 )
-from app.models.entities import Users, UserPermission
+from app.models.entities import (
+    Users,
+    UserPermission,
+    Role as RoleModel,
+    Permission as PermissionModel,
+    ConsultantProfile as ConsultantProfileModel,
+    ContentManagerProfile as ContentManagerProfileModel,
+    AdmissionOfficialProfile as AdmissionOfficialProfileModel,
+    CustomerProfile as CustomerProfileModel,
+    Interest as InterestModel,
+)
 
 router = APIRouter()
 
+# (email, HMAC-SHA256(SECRET_KEY, password)) pairs that just failed verification. Password
+# hashing is deliberately slow, so repeated bad guesses are answered from here for a short while.
+# Keyed with the server secret so the near-miss passwords kept in memory are not plain hashes.
+# Only failures are cached; a correct password always goes through verify_password.
+_failed_logins = TTLCache(maxsize=10_000, ttl=30)
+_failed_logins_lock = Lock()
+
+
+def failed_login_key(email: str, password: str) -> tuple:
+    return email, hmac.new(SECRET_KEY.encode(), password.encode(), hashlib.sha256).digest()
+
+
+def forget_failed_logins(email: str):
+    """Drop the cached failures of `email`, e.g. after its password changed."""
+    with _failed_logins_lock:
+        for key in [key for key in _failed_logins.keys() if key[0] == email]:
+            _failed_logins.pop(key, None)
+
+# Role ids resolved by name pattern. Roles are seeded once and never renamed by the API,
+# so signups don't need to look them up every time; the TTL bounds staleness if they are
+# edited in the database directly. Only found ids are cached.
+_role_ids = TTLCache(maxsize=16, ttl=3600)
+_role_ids_lock = Lock()
+
+
+def get_role_id(db: Session, name_pattern: str):
+    """Id of the first role whose name matches `name_pattern` (ILIKE), or None."""
+    with _role_ids_lock:
+        role_id = _role_ids.get(name_pattern)
+    if role_id is None:
+        role_id = db.query(RoleModel.role_id).filter(RoleModel.role_name.ilike(name_pattern)).scalar()
+        if role_id is not None:
+            with _role_ids_lock:
+                _role_ids[name_pattern] = role_id
+    return role_id
+
 
 @router.post("/register", response_model=UserResponse)
 def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any:
     """
     Register a new user.
     """
-    user = db.query(Users).filter(Users.email == user_in.email).first()
+    user = db.query(Users.user_id).filter(Users.email == user_in.email).first()
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
-    
-    # Create user with basic information; role_id is deferred
+
+    # Validate permission ids first (before hashing the password or adding anything),
+    # fetching only the two columns needed
+    perms = []
+    if user_in.permissions:
+        perms = db.query(PermissionModel.permission_id, PermissionModel.permission_name).filter(
+            PermissionModel.permission_id.in_(user_in.permissions)
+        ).all()
+        if len(perms) != len(set(user_in.permissions)):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One or more permission IDs are invalid.")
+
+    # Create user with basic information; role_id is deferred.
+    # Related rows hang off the user's relationships, so nothing is flushed until the
+    # end: one flush inserts the user and then all of its dependent rows.
     user = Users(
         email=user_in.email,
         full_name=user_in.full_name,
@@ -44,110 +108,72 @@ def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any:
         status=True,
     )
     db.add(user)
-    # Flush so the new user's PK (user_id) is populated before creating UserPermission rows
-    # (Without flush/commit, user.user_id will be None for an autoincrement PK.)
-    db.flush()
 
-    # Import models that we'll need in both branches
-    from app.models.entities import Role as RoleModel
-    
-    # Add permissions if provided (validate permission ids first)
-    if user_in.permissions:
-        # Import models here to avoid circular import at module load
-        from app.models.entities import Permission as PermissionModel
-        from app.models.entities import ConsultantProfile as ConsultantProfileModel
-        from app.models.entities import ContentManagerProfile as ContentManagerProfileModel
-        from app.models.entities import AdmissionOfficialProfile as AdmissionOfficialProfileModel
-
-        # Validate permissions and get their names
-        perms = db.query(PermissionModel).filter(PermissionModel.permission_id.in_(user_in.permissions)).all()
-        if len(perms) != len(set(user_in.permissions)):
-            db.rollback()
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One or more permission IDs are invalid.")
-
-        permission_names = { (p.permission_name or "").lower() for p in perms }
+    # Add permissions if provided
+    if perms:
+        # All granted names, lower-cased and joined once: every role/profile rule
+        # below is a substring test on this one string
+        permission_names = " ".join((p.permission_name or "").lower() for p in perms)
+        has_admission = "admission" in permission_names
 
         # Assign permissions to user
-        for perm in perms:
-            db.add(UserPermission(user_id=user.user_id, permission_id=perm.permission_id))
+        user.user_permissions = [UserPermission(permission_id=perm.permission_id) for perm in perms]
 
         # Determine and set the user's role based on permissions
-        if any("admission" in name for name in permission_names):
-            admission_role = db.query(RoleModel).filter(RoleModel.role_name.ilike("%admission%")).first()
-            if admission_role:
-                user.role_id = admission_role.role_id
-            else:
-                user.role_id = None  # Or handle missing "Admission" role error
+        if has_admission:
+            # None if there is no "Admission" role (or handle missing role error)
+            user.role_id = get_role_id(db, "%admission%")
         else:
             # If permissions are given but none are admission, role is explicitly null
             user.role_id = None
         
         # Create related profiles based on granted permissions
         # Consultant profile
-        if any(name for name in permission_names if "consultant" in name):
-            consultant_profile = ConsultantProfileModel(
-                consultant_id=user.user_id,
+        if "consultant" in permission_names:
+            user.consultant_profile = ConsultantProfileModel(
                 # ConsultantProfile.status already defaults to True in the model, but set explicitly
                 status=True,
                 is_leader=bool(getattr(user_in, "consultant_is_leader", False))
             )
-            db.add(consultant_profile)
 
         # Content manager profile
-        if any(name for name in permission_names if "content" in name or "content_manager" in name or "content manager" in name):
-            content_manager_profile = ContentManagerProfileModel(
-                content_manager_id=user.user_id,
+        if "content" in permission_names:
+            user.content_manager_profile = ContentManagerProfileModel(
                 is_leader=bool(getattr(user_in, "content_manager_is_leader", False))
             )
-            db.add(content_manager_profile)
 
         # Admission official profile
-        if any(name for name in permission_names if "admission" in name or "official" in name or "admission_official" in name):
-            admission_profile = AdmissionOfficialProfileModel(
-                admission_official_id=user.user_id,
+        if has_admission or "official" in permission_names:
+            user.admission_official_profile = AdmissionOfficialProfileModel(
                 rating=0,
                 current_sessions=0,
                 max_sessions=10,
                 status="available"
             )
-            db.add(admission_profile)
     else:
         # No permissions provided => regular customer user
         # Find or create a "Customer" role
-        customer_role = db.query(RoleModel).filter(RoleModel.role_name.ilike("customer")).first()
-        if not customer_role:
-            # Create Customer role if it doesn't exist
-            customer_role = RoleModel(role_name="Customer")
-            db.add(customer_role)
-            db.flush()  # Get the role_id
-        
-        user.role_id = customer_role.role_id
+        customer_role_id = get_role_id(db, "customer")
+        if customer_role_id is not None:
+            user.role_id = customer_role_id
+        else:
+            # Create Customer role if it doesn't exist (inserted by the same flush as the user)
+            user.role = RoleModel(role_name="Customer")
         
         # Create CustomerProfile for this user
         # Optionally create an Interest record if interest data was provided during registration
-        from app.models.entities import CustomerProfile as CustomerProfileModel
-        from app.models.entities import Interest as InterestModel
-
         interest_obj = None
         if getattr(user_in, "interest_desired_major", None) or getattr(user_in, "interest_region", None):
             interest_obj = InterestModel(
                 desired_major=getattr(user_in, "interest_desired_major", None),
                 region=getattr(user_in, "interest_region", None),
             )
-            db.add(interest_obj)
-            # flush so interest_id is populated
-            db.flush()
 
-        customer_profile = CustomerProfileModel(
-            customer_id=user.user_id,
-            interest_id=interest_obj.interest_id if interest_obj else None
-        )
-        db.add(customer_profile)
+        user.customer_profile = CustomerProfileModel(interest=interest_obj)
 
-    db.commit()
-    db.refresh(user)
-    
-    # Prepare response with permissions
+    # Single flush for the whole registration, then read the generated ids before
+    # commit expires the instance (no refresh()/permissions reload afterwards)
+    db.flush()
     response = {
         "user_id": user.user_id,
         "email": user.email,
@@ -155,8 +181,10 @@ def register(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any:
         "phone_number": user.phone_number,
         "status": user.status,
         "role_id": user.role_id,
-        "permissions": [p.permission_id for p in user.permissions] if user.permissions else []
+        "permissions": [p.permission_id for p in perms]
     }
+    db.commit()
+
     return response
 
 
@@ -177,8 +205,21 @@ def login(
     email = form_data.email
     password = form_data.password
 
+    # Repeated wrong password for the same email: reject without re-running the hash
+    failed_key = failed_login_key(email, password)
+    with _failed_logins_lock:
+        recently_failed = failed_key in _failed_logins
+    if recently_failed:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+
     user = db.query(Users).filter(Users.email == email).first()
     if not user or not verify_password(password, user.password):
+        if user:
+            with _failed_logins_lock:
+                _failed_logins[failed_key] = True
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -191,8 +232,6 @@ def login(
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
-        "access_token": create_access_token(
-            {"sub": user.email, "user_id": user.user_id}
-        ),
+        "access_token": create_access_token(build_token_claims(user)),
             "token_type": "bearer",
         }
@@ -1,216 +1,431 @@
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi.concurrency import run_in_threadpool
 import asyncio
-import json
+import logging
+import orjson
 from app.models.database import SessionLocal
+from app.core.config import settings
 from app.services import training_service
-from app.services.training_service import TrainingService
+from app.services.training_service import TrainingService, get_training_service
+from app.services.semantic_cache import semantic_cache
+from app.services.tier_router import route_tier
 
 
 router = APIRouter()
-# Tạo 1 instance dùng chung
-service = TrainingService()
+logger = logging.getLogger(__name__)
+
+
+# Giao thức "v2" (client gửi "protocol": "v2" trong message đầu tiên): mỗi event là một
+# binary frame = 1 byte tag + payload. Chunk mang thẳng UTF-8 của content, các event khác
+# mang JSON của các field còn lại (không có "event"). Client cũ vẫn nhận JSON text frame.
+# Chiều client → server: message JSON gửi bằng text frame hoặc binary frame UTF-8 đều được.
+EVENT_TAGS = {"chunk": 1, "done": 2, "session_created": 3, "go": 4, "ping": 5}
+
+
+def encode_event(event: dict, compact: bool = False):
+    """JSON text frame (mặc định) hoặc binary frame của giao thức v2."""
+    if not compact:
+        return orjson.dumps(event).decode()
+    tag = EVENT_TAGS[event["event"]]
+    if tag == EVENT_TAGS["chunk"]:
+        return bytes((tag,)) + event["content"].encode()
+    return bytes((tag,)) + orjson.dumps({k: v for k, v in event.items() if k != "event"})
+
+
+# Chunk event chỉ có một field thay đổi: ghép prefix dựng sẵn với content đã encode,
+# không dựng dict và serialize cả object cho mỗi lần gửi
+_CHUNK_TEXT_PREFIX = b'{"event":"chunk","content":'
+_CHUNK_TAG = bytes((EVENT_TAGS["chunk"],))
+
+
+def encode_chunk(content: str, compact: bool = False):
+    """Giống encode_event({"event": "chunk", "content": content}, compact), nhanh hơn."""
+    if compact:
+        return _CHUNK_TAG + content.encode()
+    return (_CHUNK_TEXT_PREFIX + orjson.dumps(content) + b"}").decode()
+
+
+async def send_frame(websocket: WebSocket, frame):
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
+
+
+async def send_event(websocket: WebSocket, event: dict):
+    """
+    Gửi một event qua websocket theo giao thức client đã chọn (websocket.state.compact_frames).
+    JSON dùng orjson (C) thay cho json.dumps; mặc định vẫn là text frame để client cũ
+    đọc bằng JSON.parse(event.data).
+    """
+    await send_frame(websocket, encode_event(event, getattr(websocket.state, "compact_frames", False)))
+
+
+# Lời chào giống nhau cho mọi kết nối → serialize một lần khi load module (cho cả 2 giao thức)
+GREETING_CHUNKS = [
+    "Rất vui được đồng hành cùng bạn!\nMình có thể giúp bạn:",
+    "\n\n1️⃣ Giới thiệu ngành học, chương trình đào tạo.",
+    "\n\n2️⃣ Tư vấn lộ trình học tập và cơ hội nghề nghiệp.",
+    "\n\n3️⃣ Cung cấp thông tin tuyển sinh, học bổng, ký túc xá.",
+    "\n\nBạn muốn bắt đầu tìm hiểu về lĩnh vực nào trước? 😄"
+]
+GREETING_FRAMES = {
+    compact: [encode_event({"event": "chunk", "content": chunk}, compact) for chunk in GREETING_CHUNKS]
+    for compact in (False, True)
+}
+GO_FRAME = {
+    compact: encode_event({"event": "go", "sources": [], "confidence": 1.0}, compact)
+    for compact in (False, True)
+}
+
+# Tầng trả lời → hàm stream tương ứng, cùng một bộ tham số
+# (service, enriched_query, context, session_id, user_id, intent_id, message)
+TIER_STREAMERS = {
+    # TIER 2: document đủ tin cậy
+    "document": lambda service, query, context, session_id, user_id, intent_id, message:
+        service.stream_response_from_context(query, context, session_id, user_id, intent_id, message),
+    # TIER 3: tư vấn theo hồ sơ cá nhân
+    "recommendation": lambda service, query, context, session_id, user_id, intent_id, message:
+        service.stream_response_from_recommendation(user_id, session_id, query, message),
+    # Không liên quan, hoặc document có confidence thấp
+    "nope": lambda service, query, context, session_id, user_id, intent_id, message:
+        service.stream_response_from_NA(query, context, session_id, user_id, 0, message),
+}
+
+
+class TokenCoalescer:
+    """
+    Gom các token nhỏ của LLM thành ít chunk event hơn: flush khi buffer đạt max_chars
+    hoặc max_ms sau token đầu tiên đang chờ, và flush phần còn lại khi thoát `async with`.
+    """
+
+    def __init__(self, websocket: WebSocket, max_chars: int = 512, max_ms: int = 30):
+        self.websocket = websocket
+        self.max_chars = max_chars
+        self.max_ms = max_ms
+        self._parts = []
+        self._size = 0
+        self._timer = None
+        # Giữ đúng thứ tự giữa flush theo timer và flush trực tiếp
+        self._send_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._cancel_timer()
+        if exc_type is None:
+            await self.flush()
+
+    async def add(self, text: str):
+        if not text:
+            return
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_ms / 1000, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        # Client ngắt giữa chừng: lỗi đã được vòng chính xử lý, không log lại ở task này
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self):
+        self._cancel_timer()
+        async with self._send_lock:
+            if not self._parts:
+                return
+            content = "".join(self._parts)
+            self._parts.clear()
+            self._size = 0
+            compact = getattr(self.websocket.state, "compact_frames", False)
+            await send_frame(self.websocket, encode_chunk(content, compact))
+
+
+# Số token LLM được đọc trước khi client chậm làm producer phải chờ
+STREAM_QUEUE_SIZE = 64
+_STREAM_END = object()
+
+
+def _chunk_text(chunk) -> str:
+    return chunk.content
+
+
+async def stream_chunks(websocket: WebSocket, stream) -> str:
+    """
+    Gửi câu trả lời đang stream, trả về toàn bộ câu trả lời.
+    Một task đọc LLM stream vào queue giới hạn, vòng gửi websocket (token được gom theo
+    TokenCoalescer) lấy ra từ queue: client chậm không làm LLM stream dừng theo từng frame.
+    """
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    async def produce():
+        try:
+            # Mọi chunk của một stream cùng kiểu (AIMessageChunk hoặc str): chọn cách lấy text
+            # một lần theo chunk đầu tiên thay vì getattr + str() cho từng token
+            extract = None
+            async for chunk in stream:
+                if extract is None:
+                    extract = _chunk_text if hasattr(type(chunk), "content") else str
+                await queue.put(extract(chunk))
+        except Exception as e:
+            await queue.put(e)  # vòng gửi raise lại
+            return
+        await queue.put(_STREAM_END)
+
+    producer = asyncio.create_task(produce())
+    parts = []
+    try:
+        async with TokenCoalescer(websocket) as coalescer:
+            while (content := await queue.get()) is not _STREAM_END:
+                if isinstance(content, Exception):
+                    raise content
+                parts.append(content)
+                await coalescer.add(content)
+        await producer
+    finally:
+        # Client ngắt giữa chừng → dừng đọc LLM
+        if not producer.done():
+            producer.cancel()
+    return "".join(parts)
+
+def context_and_sources(doc_results) -> tuple:
+    """(context cho prompt, document_id của từng chunk) trong một lượt qua kết quả search."""
+    context_parts = []
+    sources = []
+    for r in doc_results:
+        payload = r.payload
+        context_parts.append(payload.get("chunk_text", ""))
+        sources.append(payload.get("document_id"))
+    return "\n\n".join(context_parts), sources
+
+
+async def receive_payload(websocket: WebSocket) -> dict:
+    """
+    Message JSON tiếp theo của client, nhận được cả text frame lẫn binary frame (UTF-8 JSON,
+    client v2 có thể gửi binary). orjson parse thẳng bytes/str, không qua json.loads.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    payload = message.get("bytes")
+    if payload is None:
+        payload = message.get("text") or ""
+    return orjson.loads(payload)
+
+
+async def receive_message(websocket: WebSocket):
+    """
+    Message tiếp theo của client, hoặc None nếu client im lặng quá lâu (kết nối đã được đóng).
+    Hết WS_IDLE_TIMEOUT giây thì gửi event "ping"; client phải gửi lại bất kỳ message nào
+    (vd. {"event": "pong"}) trong WS_PING_GRACE giây, nếu không kết nối bị đóng với code 1001.
+    """
+    try:
+        return await asyncio.wait_for(receive_payload(websocket), timeout=settings.WS_IDLE_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+    await send_event(websocket, {"event": "ping"})
+    try:
+        return await asyncio.wait_for(receive_payload(websocket), timeout=settings.WS_PING_GRACE)
+    except asyncio.TimeoutError:
+        await websocket.close(code=1001)
+        return None
+
+
 #thêm 3 tầng check chat
 @router.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
     # session_id = 1
     # user_id = 1
     
-    service = TrainingService()
+    # Instance dùng chung, tạo một lần trong lifespan
+    service: TrainingService = websocket.app.state.training_service
     await websocket.accept()
     
     # 1️⃣ Nhận thông tin user và session trước
-    data = await websocket.receive_json()
+    data = await receive_payload(websocket)
     user_id = data.get("user_id")
     session_id = data.get("session_id")
+    websocket.state.compact_frames = compact = data.get("protocol") == "v2"
    
     
 
     if not session_id:
-        session_id = service.create_chat_session(user_id, "chatbot")
-        await websocket.send_json({
+        # DB insert chạy trong threadpool, không chặn event loop của các websocket khác
+        session_id = await run_in_threadpool(service.create_chat_session, user_id, "chatbot")
+        await send_event(websocket, {
             "event": "session_created",
             "session_id": session_id
         })
 
     # 2️⃣ Sau khi nhận xong → gửi lời chào
-    greeting_chunks = [
-        "Rất vui được đồng hành cùng bạn!\nMình có thể giúp bạn:",
-        "\n\n1️⃣ Giới thiệu ngành học, chương trình đào tạo.",
-        "\n\n2️⃣ Tư vấn lộ trình học tập và cơ hội nghề nghiệp.",
-        "\n\n3️⃣ Cung cấp thông tin tuyển sinh, học bổng, ký túc xá.",
-        "\n\nBạn muốn bắt đầu tìm hiểu về lĩnh vực nào trước? 😄"
-    ]
-    for chunk in greeting_chunks:
-        await websocket.send_json({"event": "chunk", "content": chunk})
-        await asyncio.sleep(0.05)
-
-    await websocket.send_json({"event": "go", "sources": [], "confidence": 1.0})
+    for frame in GREETING_FRAMES[compact]:
+        await send_frame(websocket, frame)
+        if settings.GREETING_TYPEWRITER_EFFECT:
+            await asyncio.sleep(0.05)
+
+    await send_frame(websocket, GO_FRAME[compact])
+
  
     try:
         while True:
-            # Nhận tin nhắn từ client
-            raw_data = await websocket.receive_json()
+            # Nhận tin nhắn từ client; client im lặng quá lâu → đóng để giải phóng session
+            raw_data = await receive_message(websocket)
+            if raw_data is None:
+                logger.debug("Idle websocket closed")
+                break
             message = raw_data.get("message", "").strip()
             if not message:
                 continue
 
              # enrich_query — tạo truy vấn "đầy đủ" dựa vào hội thoại cũ
             enriched_query = await service.enrich_query(session_id, message)
-            print(f"👉 enriched_query: {enriched_query}")
+            logger.debug("enriched_query: %s", enriched_query)
 
              # Nếu enrich_query rỗng, nghĩa là user nói lan man → không cần RAG
             if not enriched_query:
-                await websocket.send_json({
+                await send_event(websocket, {
                     "event": "chunk",
                     "content": "Mình chưa rõ ý bạn lắm, bạn có thể nói rõ hơn được không?"
                 })
-                await websocket.send_json({"event": "done", "sources": [], "confidence": 0.0})
+                await send_event(websocket, {"event": "done", "sources": [], "confidence": 0.0})
                 continue
 
 
             # Tìm context liên quan
             # doc_results = TrainingService.search_documents(message, top_k=5)
            
+            # Embed enriched_query một lần: dùng cho semantic cache và hybrid search.
+            # Gọi embedding API bằng client async, không chặn các chat khác
+            q_vec = await service.aembed_query(enriched_query)
+
+            # Semantic cache: câu hỏi (gần) trùng câu đã trả lời → bỏ qua search + các bước LLM check
+            # (nhân ma trận cả tầng static, nạp lại tầng static nếu vừa bị invalidate: chạy trên
+            # search_pool, không chiếm event loop)
+            cached = await service.run_search(semantic_cache.lookup, q_vec)
+            if cached:
+                await stream_chunks(websocket, service.stream_response_from_qa(
+                    enriched_query, cached["answer"], session_id, user_id, cached["intent_id"], message
+                ))
+                await send_event(websocket, {
+                    "event": "done",
+                    "sources": cached["sources"],
+                    "confidence": cached["confidence"]
+                })
+                continue
+
             # Hybrid search (cả training QA và document)
-            result = service.hybrid_search(enriched_query)
+            # Search chạy song song với việc warm kết nối LLM: bước LLM kế tiếp (relevance check,
+            # phân tầng hoặc stream câu trả lời) không phải chờ bắt tay kết nối sau khi search xong
+            result, _ = await asyncio.gather(
+                service.run_search(service.hybrid_search, enriched_query, q_vec),
+                service.warm_llm_connection()
+            )
             tier_source = result.get("response_source")
             confidence = result.get("confidence", 0.0)
 
             # === TIER 1: training_qa - score > 0.8 ===
             if tier_source == "training_qa" and confidence > 0.7:
-                print("floor 1")
+                logger.debug("floor 1")
                 top = result["top_match"]
                 q_text = top.payload.get("question_text")
                 a_text = top.payload.get("answer_text")
                 intent_id = top.payload.get("intent_id")
-                relevance_ok = await service.llm_relevance_check(enriched_query, q_text, a_text)
+                # Chạy song song: LLM kiểm tra QA + tìm document sẵn cho trường hợp fallback
+                relevance_ok, doc_results = await asyncio.gather(
+                    service.llm_relevance_check(enriched_query, q_text, a_text),
+                    service.asearch_documents(enriched_query, 5, q_vec)
+                )
 
                 if relevance_ok:
-                    print("floor 1: training QA valid")
-                    async for chunk in service.stream_response_from_qa(enriched_query, a_text, session_id, user_id, intent_id, message):
-                        await websocket.send_text(json.dumps({
-                            "event": "chunk",
-                            "content": getattr(chunk, "content", str(chunk))
-                        }))
-                    await websocket.send_json({
+                    logger.debug("floor 1: training QA valid")
+                    await stream_chunks(websocket, service.stream_response_from_qa(
+                        enriched_query, a_text, session_id, user_id, intent_id, message
+                    ))
+                    await send_event(websocket, {
                         "event": "done",
                         "sources": [q_text],
                         "confidence": confidence
                     })
+                    # Chỉ cache câu trả lời chính thức của training QA: không phụ thuộc lịch sử chat,
+                    # lúc trúng cache vẫn được viết lại theo session hiện tại (stream_response_from_qa)
+                    semantic_cache.add(q_vec, a_text, [q_text], confidence, intent_id)
                     continue
                 else:
-                    print("QA not relevant → fallback xuống document")
-                    # Chạy document search lại
-                    doc_results = service.search_documents(enriched_query, top_k=5)
+                    logger.debug("QA not relevant → fallback xuống document")
+                    # Dùng kết quả document search đã chạy song song ở trên
                     result = {
                         "response": doc_results,
-                        "intent_id": doc_results[0].payload.get("intent_id"),
+                        "intent_id": doc_results[0].payload.get("intent_id") if doc_results else 0,
                         "response_source": "document",
                         "confidence": doc_results[0].score if doc_results else 0.0,
-                        "sources": [r.payload.get("document_id") for r in doc_results]
                     }
                     tier_source = "document"
                     
-            context_chunks = result["response"]
+            # Tới đây result luôn là kết quả document search (hybrid_search hoặc fallback của tier 1),
+            # context + sources lấy trong một lượt qua các chunk, dùng cho phân tầng, prompt và event done
             intent_id = result["intent_id"]
-            context = "\n\n".join([
-                r.payload.get("chunk_text", "") for r in context_chunks
-            ])
-            
-            tier_source = await service.llm_document_recommendation_check(enriched_query, context)
+            context, sources = context_and_sources(result["response"])
+
+            # Câu rõ ràng (từ khóa) được phân tầng ngay, còn lại mới hỏi LLM
+            tier_source = (
+                route_tier(enriched_query, context, result.get("confidence", 0.0))
+                or await service.llm_document_recommendation_check(enriched_query, context)
+            )
             if(tier_source == "document"):
-                doc_results = service.search_documents(enriched_query, top_k=5)
-                result = {
-                    "response": doc_results,
-                    "intent_id": doc_results[0].payload.get("intent_id"),
-                    "response_source": "document",
-                    "confidence": doc_results[0].score if doc_results else 0.0,
-                    "sources": [r.payload.get("document_id") for r in doc_results]
-                }
-                confidence = doc_results[0].score if doc_results else 0.0
-                print("Context:" + context)
-                print("Confidence of document:")
-                print(confidence)
-            print("SOURCE NAME: " + tier_source)
-            # === TIER 2: document-only (no QA match) ===
-            if tier_source == "document" and confidence >= 0.5:
-                print("🔍 floor 3: using document context")
-                
-                async for chunk in service.stream_response_from_context(
-                    enriched_query, context, session_id, user_id, intent_id, message
-                ):
-                    await websocket.send_text(json.dumps({
-                        "event": "chunk",
-                        "content": getattr(chunk, "content", str(chunk))
-                    }))
-                    # Gửi tín hiệu kết thúc khi hoàn tất
-                try:
-                    await websocket.send_json({
-                        "event": "done",
-                        "sources": result.get("sources", []),
-                        "confidence": confidence
-                    })
-                    continue
-                except Exception:
-                    print("Không thể gửi event done vì client đã ngắt.")
-                    break
-                # === TIER 3: recommedation ===
-            elif tier_source == "recommendation":
-                print("floor 4: using recommendation layer")
-                   
-                async for chunk in service.stream_response_from_recommendation(
-                    user_id, session_id, enriched_query, message
-                ):
-                    await websocket.send_text(json.dumps({
-                        "event": "chunk",
-                        "content": getattr(chunk, "content", str(chunk))
-                    }))
-                    # Gửi tín hiệu kết thúc khi hoàn tất
-                try:
-                    await websocket.send_json({
-                        "event": "done",
-                        "sources": result.get("sources", []),
-                        "confidence": confidence
-                    })
-                    continue
-                except Exception:
-                    print("Không thể gửi event done vì client đã ngắt.")
-                    break
-
-            elif tier_source == "document" or tier_source == "nope":
-                print("floor 5: nope layer")
-                async for chunk in service.stream_response_from_NA(
-                    enriched_query, context, session_id, user_id, 0, message
-                ):
-                    await websocket.send_text(json.dumps({
-                        "event": "chunk",
-                        "content": getattr(chunk, "content", str(chunk))
-                    }))
-                    # Gửi tín hiệu kết thúc khi hoàn tất
-                try:
-                    await websocket.send_json({
-                        "event": "done",
-                        "sources": result.get("sources", []),
-                        "confidence": confidence
-                    })
-                    continue
-                except Exception:
-                    print("Không thể gửi event done vì client đã ngắt.")
-                    break
-                
-                
+                # Cùng query vector, cùng top_k → dùng lại kết quả đã có thay vì search lại
+                confidence = result.get("confidence", 0.0)
+                logger.debug("Context: %s", context)
+                logger.debug("Confidence of document: %s", confidence)
+            logger.debug("SOURCE NAME: %s", tier_source)
+            if tier_source == "document" and confidence < 0.5:
+                tier_source = "nope"
+            logger.debug("floor: %s", tier_source)
+
+            await stream_chunks(websocket, TIER_STREAMERS[tier_source](
+                service, enriched_query, context, session_id, user_id, intent_id, message
+            ))
+            # Gửi tín hiệu kết thúc khi hoàn tất
+            try:
+                await send_event(websocket, {
+                    "event": "done",
+                    "sources": sources,
+                    "confidence": confidence
+                })
+            except Exception:
+                logger.info("Không thể gửi event done vì client đã ngắt.")
+                break
+
     except WebSocketDisconnect:
         # memory_manager.remove_memory(session_id)
-        print("Client disconnected")
+        logger.debug("Client disconnected")
                 
 
 # ================== REST API: SESSION ==================
 
+# Các endpoint session là async: DB đồng bộ chạy qua asyncio.to_thread (executor riêng của
+# event loop), không chiếm threadpool của Starlette mà websocket/route sync đang dùng chung
+_session_db_slots = asyncio.Semaphore(32)
+
+async def run_session_db(fn, *args, **kwargs):
+    """Chạy một hàm DB đồng bộ của TrainingService, tối đa 32 lời gọi cùng lúc."""
+    async with _session_db_slots:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
 # Tạo 1 phiên chat session mới
 @router.post("/session/create")
-def api_create_chat_session(user_id: int, session_type: str):
+async def api_create_chat_session(user_id: int, session_type: str, service: TrainingService = Depends(get_training_service)):
     try:
-        session_id = service.create_chat_session(
+        session_id = await run_session_db(
+            service.create_chat_session,
             user_id=user_id,
             session_type=session_type
         )
@@ -221,9 +436,9 @@ def api_create_chat_session(user_id: int, session_type: str):
 
 # Lấy lịch sử chat theo session ID
 @router.get("/session/{session_id}/history")
-def api_get_session_history(session_id: int, limit: int = 50):
+async def api_get_session_history(session_id: int, limit: int = 50, service: TrainingService = Depends(get_training_service)):
     try:
-        history = service.get_session_history(session_id, limit)
+        history = await run_session_db(service.get_session_history, session_id, limit)
         return {"session_id": session_id, "messages": history}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -231,22 +446,22 @@ def api_get_session_history(session_id: int, limit: int = 50):
 
 # Lấy tất cả session của user
 @router.get("/user/{user_id}/sessions")
-def api_get_user_sessions(user_id: int):
+async def api_get_user_sessions(user_id: int, service: TrainingService = Depends(get_training_service)):
     try:
-        sessions = service.get_user_sessions(user_id)
+        sessions = await run_session_db(service.get_user_sessions, user_id)
         return {"user_id": user_id, "sessions": sessions}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 # Xóa 1 session chat
 @router.delete("/session/{session_id}")
-def api_delete_chat_session(session_id: int, user_id: int | None = None):
+async def api_delete_chat_session(session_id: int, user_id: int | None = None, service: TrainingService = Depends(get_training_service)):
     """
     - Nếu truyền user_id: chỉ cho xóa session thuộc user đó
     - Nếu không truyền user_id: xóa theo session_id (guest session)
     """
     try:
-        deleted = service.delete_chat_session(session_id=session_id, user_id=user_id)
+        deleted = await run_session_db(service.delete_chat_session, session_id=session_id, user_id=user_id)
         if not deleted:
             raise HTTPException(status_code=404, detail="Session not found")
         return {"message": "Session deleted successfully"}
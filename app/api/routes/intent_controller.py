@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.models import entities, schemas
 from app.models.database import get_db
-from app.core.security import get_current_user, has_permission
+from app.core.security import get_current_user, has_permission, can_view_knowledge
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 def check_create_edit_permission(current_user: entities.Users = Depends(get_current_user)):
-    if not current_user or not (has_permission(current_user, "admin") or has_permission(current_user, "consultant")):
+    # has_permission already lets admins through
+    if not has_permission(current_user, "consultant"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin or Consultant permission required"
@@ -21,16 +23,7 @@ def check_view_permission(current_user: entities.Users = Depends(get_current_use
     if not current_user:
          raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
 
-    try:
-        user_perms_list = [p.permission_name.lower() for p in current_user.permissions] 
-    except AttributeError:
-        user_perms_list = [p.lower() for p in current_user.permissions]
-
-    is_admin_or_consultant = "admin" in user_perms_list or "consultant" in user_perms_list
-
-    is_admission_related = any("admission" in p for p in user_perms_list)
-
-    if not (is_admin_or_consultant or is_admission_related):
+    if not can_view_knowledge(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin, Consultant, or Admission permission required"
@@ -1,41 +1,98 @@
 from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, APIRouter, Form, Query
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
 import os
 import json
+import logging
+import orjson
 import uuid
 from datetime import datetime
 
 from app.models.database import init_db, get_db
 from app.models.schemas import TrainingQuestionRequest, TrainingQuestionResponse, KnowledgeBaseDocumentResponse
 from app.models import entities
-from app.services.training_service import TrainingService
-from app.utils.document_processor import documentProcessor
-from app.core.security import get_current_user, has_permission
+from app.services.training_service import TrainingService, get_training_service
+from app.utils.document_processor import FileKind, SNIFF_SIZE, documentProcessor
+from app.core.security import can_view_knowledge, get_current_user, get_permission_names, has_permission
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+# Pool cho bước extract text của upload_document (giới hạn số file được parse cùng lúc)
+EXTRACT_POOL = ThreadPoolExecutor(max_workers=4)
+UPLOAD_READ_CHUNK = 1 << 20  # 1MB mỗi lần đọc UploadFile
+
+def training_question_list_query():
+    """
+    Lean statement for the training question list: only the columns TrainingQuestionResponse
+    needs, intent name joined in the same SQL statement.
+    """
+    tqa = entities.TrainingQuestionAnswer
+    return (
+        select(
+            tqa.question_id,
+            tqa.question,
+            tqa.answer,
+            tqa.intent_id,
+            entities.Intent.intent_name,
+            tqa.status,
+            tqa.created_at,
+            tqa.approved_at,
+            tqa.created_by,
+            tqa.approved_by,
+            tqa.reject_reason,
+        )
+        .outerjoin(entities.Intent, entities.Intent.intent_id == tqa.intent_id)
+    )
+
+def document_list_query():
+    """Lean statement for the document list: only the columns KnowledgeBaseDocumentResponse needs."""
+    doc = entities.KnowledgeBaseDocument
+    return select(
+        doc.document_id,
+        doc.title,
+        doc.file_path,
+        doc.category,
+        doc.created_at,
+        doc.updated_at,
+        doc.created_by,
+        doc.status,
+        doc.reviewed_by,
+        doc.reviewed_at,
+        doc.reject_reason,
+    )
+
+LIST_PAGE_MAX = 500
+EXPORT_BATCH_SIZE = 500
+
+def stream_json_rows(db: Session, stmt):
+    """
+    JSON array of every row of `stmt`, produced chunk by chunk: rows are fetched
+    EXPORT_BATCH_SIZE at a time (yield_per) and each one is dumped with orjson,
+    so neither the rows nor the response body are held in memory as a whole.
+    """
+    yield b"["
+    separator = b""
+    for row in db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)).mappings():
+        yield separator + orjson.dumps(dict(row))
+        separator = b","
+    yield b"]"
 
 def check_view_permission(current_user: entities.Users = Depends(get_current_user)):
     """Check if user has permission to view training questions (Admin, Consultant, or Admission Official)"""
     if not current_user:
         raise HTTPException(status_code=403, detail="Not authenticated")
 
-    try:
-        user_perms_list = [p.permission_name.lower() for p in current_user.permissions] 
-    except AttributeError:
-        user_perms_list = [p.lower() for p in current_user.permissions]
-
-    # Check for Admin, Consultant, or Admission Official permissions
-    is_admin = "admin" in user_perms_list
-    is_consultant = "consultant" in user_perms_list
-    is_admission_official = any(
-        "admission" in p or "admission official" in p 
-        for p in user_perms_list
-    )
-
-    if not (is_admin or is_consultant or is_admission_official):
+    if not can_view_knowledge(current_user):
         raise HTTPException(
             status_code=403,
             detail="Admin, Consultant, or Admission Official permission required"
@@ -79,27 +136,41 @@ def resolve_file_path(relative_path: str) -> Path:
     
     return path
 
-def check_file_exists(file_path: str) -> Path:
+def check_file_exists(file_path: str) -> tuple[Path, os.stat_result]:
     """
     Helper function to check if file exists on disk or raise 404.
-    Returns the resolved absolute path.
+    Returns the resolved absolute path and its stat result (passed on to FileResponse
+    so the file is only stat'ed once per request).
     """
     resolved_path = resolve_file_path(file_path)
-    if not resolved_path.exists():
+    try:
+        stat_result = os.stat(resolved_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=404, 
             detail=f"File not found on server. Looking for: {resolved_path}"
         )
-    return resolved_path
+    return resolved_path, stat_result
+
+# Media type hiển thị inline theo đuôi file (view_document)
+VIEW_MEDIA_TYPES = {
+    '.pdf': 'application/pdf',
+    '.txt': 'text/plain',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif'
+}
 
 @router.post("/upload/training_question")
 def api_create_training_qa(
     payload: TrainingQuestionRequest,
     db: Session = Depends(get_db),
-    current_user_id: int = 1
+    current_user_id: int = 1,
+    service: TrainingService = Depends(get_training_service)
 ):
-    service = TrainingService()
-
     qa = service.create_training_qa(
         db=db,
         intent_id=payload.intent_id,
@@ -113,6 +184,39 @@ def api_create_training_qa(
         "qa_id": qa.question_id,
         "status": qa.status
     }
+TRAINING_QA_BATCH_LIMIT = 200
+
+@router.post("/upload/training_questions_batch")
+def api_create_training_qa_batch(
+    payload: List[TrainingQuestionRequest],
+    db: Session = Depends(get_db),
+    current_user_id: int = 1,
+    service: TrainingService = Depends(get_training_service)
+):
+    """Create several training QA drafts at once with one multi-row INSERT."""
+    if not payload:
+        raise HTTPException(status_code=400, detail="No training questions provided")
+    if len(payload) > TRAINING_QA_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {TRAINING_QA_BATCH_LIMIT} training questions per request")
+
+    qa_ids = service.create_training_qa_batch(db=db, items=payload, created_by=current_user_id)
+
+    return {
+        "message": "Training QA created as draft",
+        "qa_ids": qa_ids,
+        "status": "draft"
+    }
+
+def duplicate_document_response(doc, chunk_count: int):
+    return {
+        "message": "Document already uploaded.",
+        "document_id": doc.document_id,
+        "intend_id": doc.intend_id,
+        "status": doc.status,
+        "chunk_count": chunk_count,
+        "duplicate": True
+    }
+
 @router.post("/upload/document")
 async def upload_document(
     intend_id: int = Query(...),
@@ -120,84 +224,127 @@ async def upload_document(
     title: str = Form(None),
     category: str = Form(None),
     current_user_id: int = Form(1),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    service: TrainingService = Depends(get_training_service)
 ):
-    print(f"\n[1] BẮT ĐẦU REQUEST Upload. Filename: {file.filename}", flush=True)
+    logger.debug("Upload document: %s", file.filename)
     # STEP 1: VALIDATE FILE
     try:
-        print("[2] Đang gọi validate_file...", flush=True)
         is_valid, error_msg = documentProcessor.validate_file(file.filename, file.content_type)
         if not is_valid:
-            print(f"[FAIL] Validate thất bại: {error_msg}", flush=True)
+            logger.info("Upload rejected (%s): %s", file.filename, error_msg)
             raise HTTPException(status_code=400, detail=error_msg)
     except Exception as e:
-        print(f"[ERROR] Lỗi tại bước Validate: {e}", flush=True)
+        logger.info("Upload validation error (%s): %s", file.filename, e)
         raise HTTPException(status_code=400, detail=str(e))
     
-    # STEP 2: READ FILE
+    # STEP 2: STREAM FILE TO DISK
+    # Ghi thẳng từng đoạn UPLOAD_READ_CHUNK vào file đích thay vì đọc cả file (tới 50MB) vào RAM
+    upload_dir = Path("uploads")
+    upload_dir.mkdir(exist_ok=True)
+    unique_filename = f"{uuid.uuid4()}_{file.filename}"
+    file_path = upload_dir / unique_filename
     try:
-        print("[3] Đang đọc file vào RAM (await file.read())...", flush=True)
-        file_content = await file.read()
-        print(f"[4] Đọc file XONG. Kích thước: {len(file_content)} bytes", flush=True)
-        if len(file_content) > 50 * 1024 * 1024:
-            raise HTTPException(status_code=413, detail="File too large (max 50MB)")
+        total = 0
+        head = b""
+        # Băm dần theo từng đoạn đang ghi, không phải đọc lại file
+        hasher = hashlib.sha256()
+        with open(file_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_READ_CHUNK):
+                if len(head) < SNIFF_SIZE:
+                    head += chunk[:SNIFF_SIZE - len(head)]
+                total += len(chunk)
+                if total > MAX_UPLOAD_SIZE:
+                    raise HTTPException(status_code=413, detail="File too large (max 50MB)")
+                hasher.update(chunk)
+                f.write(chunk)
+        content_hash = hasher.hexdigest()
+        logger.debug("Saved upload to %s (%d bytes)", file_path, total)
+    except HTTPException:
+        file_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
-        print(f"[ERROR] Lỗi khi đọc file: {e}", flush=True)
+        file_path.unlink(missing_ok=True)
+        logger.error("Error saving upload %s: %s", file.filename, e)
         raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
 
-    # STEP 3: EXTRACT TEXT
+    # File đã upload rồi (draft/approved) → trả document cũ, bỏ qua extract + lưu
+    existing, chunk_count = await run_in_threadpool(service.find_document_by_hash, db, content_hash)
+    if existing:
+        file_path.unlink(missing_ok=True)
+        logger.info("Upload %s duplicates document %d", file.filename, existing.document_id)
+        return duplicate_document_response(existing, chunk_count)
+
+    # Nhận dạng định dạng từ magic bytes đã giữ lại khi ghi file, không đọc lại file
+    kind, error_msg = documentProcessor.classify(head, file.filename)
+    if kind is FileKind.UNKNOWN:
+        file_path.unlink(missing_ok=True)
+        logger.info("Upload rejected (%s): %s", file.filename, error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    # STEP 3: EXTRACT TEXT (parser đọc từ file đã lưu)
     try:
-        print("[5] Đang gọi extract_text (Xử lý PDF/OCR)...", flush=True)
-        extracted_text = documentProcessor.extract_text(
-            file_content,
+        # Parse PDF/DOCX tốn CPU: chạy ở pool riêng, không chặn event loop
+        extracted_text = await asyncio.get_running_loop().run_in_executor(
+            EXTRACT_POOL,
+            documentProcessor.extract_text,
+            file_path,
             file.filename,
-            file.content_type
+            file.content_type,
+            kind
         )
-        print(f"[6] Extract XONG. Kết quả text dài: {len(extracted_text) if extracted_text else 0}", flush=True)
+        logger.debug("Extracted %d characters from %s", len(extracted_text) if extracted_text else 0, file.filename)
         if not extracted_text:
             raise HTTPException(
                 status_code=422,
                 detail="Cannot extract content from the file"
             )
     except Exception as e:
-        print(f"[ERROR] Lỗi tại extract_text: {e}", flush=True)
+        file_path.unlink(missing_ok=True)
+        logger.warning("Error extracting text from %s: %s", file.filename, e)
         raise HTTPException(status_code=422, detail=f"Extract error: {str(e)}")
-
-    # STEP 4: SAVE FILE TO DISK
-    try:
-        print("[7] Đang lưu file xuống đĩa...", flush=True)
-        upload_dir = Path("uploads")
-        upload_dir.mkdir(exist_ok=True)
-
-        unique_filename = f"{uuid.uuid4()}_{file.filename}"
-        file_path = upload_dir / unique_filename
-        with open(file_path, "wb") as f:
-            f.write(file_content)
-        print(f"[8] Lưu file XONG tại: {file_path}", flush=True)
-    except Exception as e:
-        print(f"[ERROR] Lỗi khi lưu đĩa: {e}", flush=True)
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
     # STEP 5: SAVE DATABASE ONLY (NO QDRANT)
     try:
-        service = TrainingService()
-        print("[9] Đang lưu vào Database...", flush=True)
-        doc = service.create_document(
-            db=db,
-            title=file.filename,
-            file_path=str(file_path),       # <-- file text chứ không phải file gốc
-            intend_id=intend_id,
-            created_by=current_user_id
-        )
-
-        # save extracted text for approval stage
-        temp_store_path = f"uploads/temp_text_{doc.document_id}.txt"
-        with open(temp_store_path, "w", encoding="utf-8") as f:
-            f.write(extracted_text)
+        def save_draft():
+            doc = service.create_document(
+                db=db,
+                title=file.filename,
+                file_path=str(file_path),       # <-- file text chứ không phải file gốc
+                intend_id=intend_id,
+                created_by=current_user_id,
+                content_hash=content_hash
+            )
 
+            # save extracted text for approval stage
+            temp_store_path = Path(f"uploads/temp_text_{doc.document_id}.txt")
+            try:
+                with open(temp_store_path, "w", encoding="utf-8") as f:
+                    f.write(extracted_text)
+            except Exception:
+                # Không có text thì draft không duyệt được: bỏ cả bản ghi vừa tạo
+                temp_store_path.unlink(missing_ok=True)
+                db.rollback()
+                db.delete(doc)
+                db.commit()
+                raise
+            return doc
+
+        # DB insert + ghi file đồng bộ → threadpool
+        doc = await run_in_threadpool(save_draft)
+
+    except IntegrityError:
+        # Cùng file được upload song song: request kia đã lưu trước
+        db.rollback()
+        file_path.unlink(missing_ok=True)
+        existing, chunk_count = await run_in_threadpool(service.find_document_by_hash, db, content_hash)
+        if not existing:
+            raise HTTPException(status_code=409, detail="Duplicate document")
+        return duplicate_document_response(existing, chunk_count)
     except Exception as e:
-        print(f"[ERROR] Lỗi Database: {e}", flush=True)
+        logger.error("Error saving document draft %s: %s", file.filename, e)
         db.rollback()
+        file_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"DB error: {str(e)}")
 
     return {
@@ -208,87 +355,80 @@ async def upload_document(
     }
 
 
+def filtered_training_questions(status: Optional[str]):
+    stmt = training_question_list_query().order_by(entities.TrainingQuestionAnswer.question_id)
+    if status:
+        stmt = stmt.where(entities.TrainingQuestionAnswer.status == status)
+    return stmt
+
+def filtered_documents(status: Optional[str]):
+    stmt = document_list_query().order_by(entities.KnowledgeBaseDocument.document_id)
+    if status:
+        stmt = stmt.where(entities.KnowledgeBaseDocument.status == status)
+    return stmt
+
 @router.get("/training_questions", response_model=List[TrainingQuestionResponse])
 def get_all_training_questions(
     status: Optional[str] = Query(None, description="Filter by status: draft, approved, rejected, deleted"),
+    limit: int = Query(100, ge=1, le=LIST_PAGE_MAX),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db), 
     current_user: entities.Users = Depends(check_view_permission)
 ):
     """
-    Get all training questions in the system.
+    Get training questions in the system, one page at a time (ordered by question_id).
     Requires Admin, Consultant, or Admission permission.
     
     - All users can see all questions regardless of status
     - Use ?status= query parameter to filter by specific status
+    - Use /training_questions/stream to export every question in one response
     """
-    # Build query
-    query = db.query(entities.TrainingQuestionAnswer).options(joinedload(entities.TrainingQuestionAnswer.intent))
-    
-    # Apply status filter if provided
-    if status:
-        query = query.filter(entities.TrainingQuestionAnswer.status == status)
-    
-    training_questions = query.all()
-    
-    # Convert to response format
-    result = []
-    for tqa in training_questions:
-        result.append({
-            "question_id": tqa.question_id,
-            "question": tqa.question,
-            "answer": tqa.answer,
-            "intent_id": tqa.intent_id,
-            "intent_name": tqa.intent.intent_name,
-            "status": tqa.status,
-            "created_at": tqa.created_at,
-            "approved_at": tqa.approved_at,
-            "created_by": tqa.created_by,
-            "approved_by": tqa.approved_by,
-            "reject_reason": getattr(tqa, 'reject_reason', None)
-        })
-    
-    return result
+    stmt = filtered_training_questions(status).limit(limit).offset(offset)
+    # Dict rows khớp thẳng TrainingQuestionResponse, không dựng ORM object
+    return db.execute(stmt).mappings().all()
+
+@router.get("/training_questions/stream", response_model=List[TrainingQuestionResponse])
+def stream_all_training_questions(
+    status: Optional[str] = Query(None, description="Filter by status: draft, approved, rejected, deleted"),
+    db: Session = Depends(get_db), 
+    current_user: entities.Users = Depends(check_view_permission)
+):
+    """
+    Export every training question as one streamed JSON array (same fields as /training_questions).
+    Requires Admin, Consultant, or Admission permission.
+    """
+    return StreamingResponse(stream_json_rows(db, filtered_training_questions(status)), media_type="application/json")
 
 @router.get("/documents", response_model=List[KnowledgeBaseDocumentResponse])
 def get_all_documents(
     status: Optional[str] = Query(None, description="Filter by status: draft, approved, rejected, deleted"),
+    limit: int = Query(100, ge=1, le=LIST_PAGE_MAX),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db), 
     current_user: entities.Users = Depends(check_view_permission)
 ):
     """
-    Get all documents in the knowledge base.
+    Get documents in the knowledge base, one page at a time (ordered by document_id).
     Requires Admin, Consultant, or Admission permission.
     
     - All users can see all documents regardless of status
     - Use ?status= query parameter to filter by specific status
+    - Use /documents/stream to export every document in one response
     """
-    # Build query
-    query = db.query(entities.KnowledgeBaseDocument)
-    
-    # Apply status filter if provided
-    if status:
-        query = query.filter(entities.KnowledgeBaseDocument.status == status)
-    
-    documents = query.all()
-    
-    # Convert to response format
-    result = []
-    for doc in documents:
-        result.append({
-            "document_id": doc.document_id,
-            "title": doc.title,
-            "file_path": doc.file_path,
-            "category": doc.category,
-            "created_at": doc.created_at,
-            "updated_at": doc.updated_at,
-            "created_by": doc.created_by,
-            "status": doc.status,
-            "reviewed_by": doc.reviewed_by,
-            "reviewed_at": doc.reviewed_at,
-            "reject_reason": getattr(doc, 'reject_reason', None)
-        })
-    
-    return result
+    stmt = filtered_documents(status).limit(limit).offset(offset)
+    return db.execute(stmt).mappings().all()
+
+@router.get("/documents/stream", response_model=List[KnowledgeBaseDocumentResponse])
+def stream_all_documents(
+    status: Optional[str] = Query(None, description="Filter by status: draft, approved, rejected, deleted"),
+    db: Session = Depends(get_db), 
+    current_user: entities.Users = Depends(check_view_permission)
+):
+    """
+    Export every document as one streamed JSON array (same fields as /documents).
+    Requires Admin, Consultant, or Admission permission.
+    """
+    return StreamingResponse(stream_json_rows(db, filtered_documents(status)), media_type="application/json")
 
 @router.get("/documents/{document_id}/download")
 def download_document(
@@ -301,12 +441,13 @@ def download_document(
     Requires Admin, Consultant, or Admission permission.
     """
     document = get_document_or_404(document_id, db)
-    resolved_path = check_file_exists(document.file_path)
+    resolved_path, stat_result = check_file_exists(document.file_path)
     
     return FileResponse(
         path=str(resolved_path),
         filename=document.title,
-        media_type='application/octet-stream'
+        media_type='application/octet-stream',
+        stat_result=stat_result
     )
 
 @router.get("/documents/{document_id}/view")
@@ -320,27 +461,17 @@ def view_document(
     Requires Admin, Consultant, or Admission permission.
     """
     document = get_document_or_404(document_id, db)
-    check_file_exists(document.file_path)
+    resolved_path, stat_result = check_file_exists(document.file_path)
     
     # Determine media type based on file extension
-    file_extension = Path(document.file_path).suffix.lower()
-    media_type_mapping = {
-        '.pdf': 'application/pdf',
-        '.txt': 'text/plain',
-        '.doc': 'application/msword',
-        '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif'
-    }
-    
-    media_type = media_type_mapping.get(file_extension, 'application/octet-stream')
+    file_extension = os.path.splitext(document.file_path)[1].lower()
+    media_type = VIEW_MEDIA_TYPES.get(file_extension, 'application/octet-stream')
     
     return FileResponse(
-        path=document.file_path,
+        path=str(resolved_path),
         media_type=media_type,
-        headers={"Content-Disposition": "inline"}
+        headers={"Content-Disposition": "inline"},
+        stat_result=stat_result
     )
 
 @router.get("/documents/{document_id}", response_model=KnowledgeBaseDocumentResponse)
@@ -378,10 +509,7 @@ def is_admin_or_leader(user: entities.Users) -> bool:
         return False
     
     # Check if user is Admin (using permissions, not role)
-    try:
-        user_perms = [p.permission_name.lower() for p in user.permissions] 
-    except AttributeError:
-        user_perms = [p.lower() for p in user.permissions]
+    user_perms = get_permission_names(user)
     
     is_admin = "admin" in user_perms
     
@@ -439,7 +567,24 @@ def submit_document_for_review(
         raise HTTPException(status_code=403, detail="You can only submit your own documents for review")
     
     document.status = 'draft'
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Cùng nội dung (content_hash) đã được upload lại sau khi document này bị reject
+        db.rollback()
+        kbd = entities.KnowledgeBaseDocument
+        existing_id = db.query(kbd.document_id).filter(
+            kbd.content_hash == document.content_hash,
+            kbd.status.in_(("draft", "approved")),
+            kbd.document_id != document_id,
+        ).scalar()
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "A document with the same content is already in review or approved",
+                "document_id": existing_id,
+            },
+        )
     
     return {"message": "Document submitted for review successfully", "document_id": document_id}
 
@@ -448,13 +593,13 @@ def api_approve_document(
     document_id: int,
 
     db: Session = Depends(get_db),
-    current_user: entities.Users = Depends(check_leader_permission)
+    current_user: entities.Users = Depends(check_leader_permission),
+    service: TrainingService = Depends(get_training_service)
 ):
     try:
         # Get document to retrieve its intent_id
         document = get_document_or_404(document_id, db)
         
-        service = TrainingService()
         print(f"Approving document ID: {document_id}, Intent ID: {document.intend_id}")
 
         result = service.approve_document(
@@ -509,9 +654,9 @@ def reject_document(
 def delete_document(
     document_id: int,
     db: Session = Depends(get_db),
-    current_user: entities.Users = Depends(check_leader_permission)
+    current_user: entities.Users = Depends(check_leader_permission),
+    service: TrainingService = Depends(get_training_service)
 ):
-    service = TrainingService()
     """
     Soft delete a document by setting status to 'deleted'.
     Only Admin or ConsultantLeader can delete documents.
@@ -595,10 +740,10 @@ def submit_training_qa_for_review(
 def api_approve_training_qa(
     question_id: int,
     db: Session = Depends(get_db),
-    current_user: entities.Users = Depends(check_leader_permission)
+    current_user: entities.Users = Depends(check_leader_permission),
+    service: TrainingService = Depends(get_training_service)
 ):
     try:
-        service = TrainingService()
         print(f"Approving training question ID: {question_id}")
         result = service.approve_training_qa(
             db=db,
@@ -670,9 +815,9 @@ def reject_training_qa(
 def delete_training_qa(
     question_id: int,
     db: Session = Depends(get_db),
-    current_user: entities.Users = Depends(check_leader_permission)
+    current_user: entities.Users = Depends(check_leader_permission),
+    service: TrainingService = Depends(get_training_service)
 ):
-    service = TrainingService()
     """
     Soft delete a training Q&A by setting status to 'deleted'.
     Only Admin or ConsultantLeader can delete Q&A.
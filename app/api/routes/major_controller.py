@@ -1,15 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, selectinload
 from app.models.database import get_db
 from app.models.schemas import MajorDetailResponse
-from app.models.entities import Major, Users
+from app.models.entities import Major, Users, Article
 from typing import List, Optional
 from app.core.security import get_current_user
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Relationships read by MajorDetailResponse, loaded up front instead of once per major/article
+MAJOR_DETAIL_LOADS = (
+    selectinload(Major.articles).selectinload(Article.specialization),
+    selectinload(Major.admission_forms),
+)
 
 @router.get("", response_model=List[MajorDetailResponse])
-async def get_all_majors(
+def get_all_majors(
     db: Session = Depends(get_db),
     current_user: Optional[Users] = Depends(get_current_user)
 ):
@@ -17,7 +24,7 @@ async def get_all_majors(
     Get all majors with their curriculum and courses information.
     This endpoint is public and can be accessed without authentication.
     """
-    majors = db.query(Major).all()
+    majors = db.query(Major).options(*MAJOR_DETAIL_LOADS).all()
     
     if not majors:
         raise HTTPException(
@@ -57,7 +64,7 @@ async def get_all_majors(
     return response
 
 @router.get("/{major_id}", response_model=MajorDetailResponse)
-async def get_major_detail(
+def get_major_detail(
     major_id: int,
     db: Session = Depends(get_db),
     current_user: Optional[Users] = Depends(get_current_user)
@@ -66,7 +73,7 @@ async def get_major_detail(
     Get detailed information about a specific major.
     This endpoint is public and can be accessed without authentication.
     """
-    major = db.query(Major).filter(Major.major_id == major_id).first()
+    major = db.get(Major, major_id, options=MAJOR_DETAIL_LOADS)
     
     if not major:
         raise HTTPException(
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.models import schemas, database, entities
 from app.core.security import get_current_user
 from typing import Optional
 
-from app.services.training_service import TrainingService
+from app.services.training_service import TrainingService, get_training_service
 
 router = APIRouter()
 
@@ -13,7 +14,7 @@ async def submit_riasec(
     riasec_result: schemas.RiasecResultCreate,
     db: Session = Depends(database.get_db),
     current_user: Optional[entities.Users] = Depends(get_current_user),
-   
+    service: TrainingService = Depends(get_training_service),
 ):
     """
     Logic đơn giản:
@@ -21,7 +22,6 @@ async def submit_riasec(
     - Nếu có user đăng nhập → lưu vào DB.
     - Nếu không → chỉ trả summary (không lưu DB).
     """
-    service = TrainingService()
     # 1) Gọi LLM để tạo summary RIASEC
     summary_text = await service.response_from_riasec_result(riasec_result)
 
@@ -32,17 +32,22 @@ async def submit_riasec(
             "scores": riasec_result
         }
 
-    # 2) User có login → lưu vào DB
+    # 2) User có login → lưu vào DB (Session đồng bộ → chạy trong threadpool,
+    #    không chặn event loop trong lúc các request khác đang chờ LLM)
+    return await run_in_threadpool(save_riasec_result, db, current_user.user_id, riasec_result, summary_text)
+
+
+def save_riasec_result(db: Session, user_id: int, riasec_result: schemas.RiasecResultCreate, summary_text: str):
     try:
         # Check if CustomerProfile exists, create if not
         customer_profile = db.query(entities.CustomerProfile).filter(
-            entities.CustomerProfile.customer_id == current_user.user_id
+            entities.CustomerProfile.customer_id == user_id
         ).first()
         
         if not customer_profile:
             # Create CustomerProfile for this user
             customer_profile = entities.CustomerProfile(
-                customer_id=current_user.user_id,
+                customer_id=user_id,
                 interest_id=None
             )
             db.add(customer_profile)
@@ -56,7 +61,7 @@ async def submit_riasec(
             score_enterprising=riasec_result.score_enterprising,
             score_conventional=riasec_result.score_conventional,
             result=summary_text,
-            customer_id=current_user.user_id
+            customer_id=user_id
         )
 
         db.add(new_result)
@@ -1,22 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, selectinload, joinedload
 from app.models.database import get_db
 from app.models.schemas import SpecializationResponse
-from app.models.entities import Specialization, Major
+from app.models.entities import Specialization, Major, Article
 from typing import List, Optional
 from app.core.security import get_current_user
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# SpecializationResponse nests ArticleResponse, which reads each article's author/major/specialization.
+# The articles come in one SELECT with their (many-to-one) author and major joined in;
+# Article.specialization is the parent already in the identity map, so it needs no load.
+SPECIALIZATION_ARTICLE_LOADS = (
+    selectinload(Specialization.articles).options(
+        joinedload(Article.author_user),
+        joinedload(Article.major),
+    ),
+)
 
 @router.get("", response_model=List[SpecializationResponse])
-async def get_all_specializations(
+def get_all_specializations(
     db: Session = Depends(get_db)
 ):
     """
     Get all specializations with their articles.
     This endpoint is public and can be accessed without authentication.
     """
-    specializations = db.query(Specialization).all()
+    specializations = db.query(Specialization).options(*SPECIALIZATION_ARTICLE_LOADS).all()
     
     if not specializations:
         raise HTTPException(
@@ -27,7 +38,7 @@ async def get_all_specializations(
     return specializations
 
 @router.get("/major/{major_id}", response_model=List[SpecializationResponse])
-async def get_specializations_by_major(
+def get_specializations_by_major(
     major_id: int,
     db: Session = Depends(get_db)
 ):
@@ -36,7 +47,7 @@ async def get_specializations_by_major(
     This endpoint is public and can be accessed without authentication.
     """
     # First check if major exists
-    major = db.query(Major).filter(Major.major_id == major_id).first()
+    major = db.get(Major, major_id)
     if not major:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -44,7 +55,7 @@ async def get_specializations_by_major(
         )
 
     # Get specializations for this major
-    specializations = db.query(Specialization).filter(
+    specializations = db.query(Specialization).options(*SPECIALIZATION_ARTICLE_LOADS).filter(
         Specialization.major_id == major_id
     ).all()
     
@@ -57,7 +68,7 @@ async def get_specializations_by_major(
     return specializations
 
 @router.get("/{specialization_id}", response_model=SpecializationResponse)
-async def get_specialization_detail(
+def get_specialization_detail(
     specialization_id: int,
     db: Session = Depends(get_db)
 ):
@@ -65,9 +76,7 @@ async def get_specialization_detail(
     Get detailed information about a specific specialization.
     This endpoint is public and can be accessed without authentication.
     """
-    specialization = db.query(Specialization).filter(
-        Specialization.specialization_id == specialization_id
-    ).first()
+    specialization = db.get(Specialization, specialization_id, options=SPECIALIZATION_ARTICLE_LOADS)
     
     if not specialization:
         raise HTTPException(
@@ -8,7 +8,8 @@ from app.models.schemas import (
     UserUpdate,
 )
 from app.models.entities import Users, UserPermission, Permission
-from app.core.security import has_permission, get_current_user, is_admin_or_admission_official
+from app.api.routes.auth_controller import forget_failed_logins
+from app.core.security import has_permission, get_current_user, invalidate_user_access, is_admin_or_admission_official
 from sqlalchemy import not_, or_
 
 router = APIRouter()
@@ -210,6 +211,7 @@ def grant_permission(
         target.status = True
 
     db.commit()
+    invalidate_user_access(target.user_id)
     return {"added": added, "skipped": skipped}
 
 
@@ -306,6 +308,7 @@ def revoke_permission(
             target.status = False
 
         db.commit()
+        invalidate_user_access(target.user_id)
         return {"removed": removed, "skipped": skipped}
     
     except HTTPException:
@@ -375,6 +378,7 @@ def update_permissions(
         target.role = None
 
     db.commit()
+    invalidate_user_access(target.user_id)
     db.refresh(target)
 
     # Return the updated user permissions
@@ -421,6 +425,7 @@ def ban_user(
 
     target.status = False
     db.commit()
+    invalidate_user_access(target.user_id)
     return {"message": "User has been banned"}
 
 
@@ -445,6 +450,7 @@ def unban_user(
 
     target.status = True
     db.commit()
+    invalidate_user_access(target.user_id)
     return {"message": "User has been unbanned"}
 
 
@@ -570,7 +576,8 @@ def update_user(
                 )
     
     # Handle password hashing if password is being updated
-    if "password" in update_data and update_data["password"]:
+    password_changed = bool(update_data.get("password"))
+    if password_changed:
         from app.core.security import get_password_hash
         update_data["password"] = get_password_hash(update_data["password"])
     
@@ -580,6 +587,11 @@ def update_user(
 
     db.commit()
     db.refresh(target)
+    # status/email có thể đã đổi: token đang dùng phải được kiểm tra lại
+    invalidate_user_access(target.user_id)
+    if password_changed:
+        # Lần đăng nhập sai vừa rồi có thể chính là mật khẩu mới
+        forget_failed_logins(target.email)
 
     # Return updated user info
     return {
@@ -1,6 +1,9 @@
 # app/utils/cloudinary.py
 import cloudinary
 import cloudinary.uploader
+import cloudinary.exceptions
+import time
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import UploadFile, HTTPException
 from app.core.config import settings
 # Cấu hình (Nên lấy từ biến môi trường .env)
@@ -11,13 +14,62 @@ cloudinary.config(
   secure = True
 )
 
+# Upload không phải gọi trong event loop: các route dùng hàm này là `def` (chạy trong threadpool)
+UPLOAD_TIMEOUT = 30  # giây cho mỗi lần gọi Cloudinary
+UPLOAD_ATTEMPTS = 3
+BATCH_UPLOAD_CONCURRENCY = 10  # số ảnh upload song song trong một lần import hàng loạt
+# Ảnh lớn hơn ngưỡng này được gửi theo từng phần (upload_large) thay vì một request duy nhất
+UPLOAD_CHUNK_SIZE = 6_000_000
+LARGE_UPLOAD_THRESHOLD = UPLOAD_CHUNK_SIZE
+# Lỗi do chính request (ảnh hỏng, sai key...) thì thử lại cũng vô ích
+NON_RETRYABLE_ERRORS = (
+    cloudinary.exceptions.BadRequest,
+    cloudinary.exceptions.AuthorizationRequired,
+    cloudinary.exceptions.NotAllowed,
+)
+
+def _upload_size(file: UploadFile) -> int:
+    """Kích thước file (byte) mà không đọc nội dung."""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, 2)
+    return file.file.tell()
+
+
 def upload_image_file(file: UploadFile) -> str:
     """
-    Upload file lên Cloudinary và trả về URL
+    Upload file lên Cloudinary và trả về URL.
+    Ảnh lớn được upload theo từng phần để không phải gửi cả file trong một request.
+    Có timeout cho mỗi lần gọi và thử lại (backoff 0.5s, 1s) khi lỗi mạng/tạm thời.
+    """
+    large = _upload_size(file) > LARGE_UPLOAD_THRESHOLD
+    # upload_large tự thử lại từng phần và đóng file khi xong, nên chỉ gọi một lần
+    attempts = 1 if large else UPLOAD_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        try:
+            # Cloudinary có thể đọc trực tiếp file-like object từ FastAPI (không read() cả file)
+            file.file.seek(0)
+            if large:
+                response = cloudinary.uploader.upload_large(
+                    file.file, chunk_size=UPLOAD_CHUNK_SIZE, resource_type="image", timeout=UPLOAD_TIMEOUT
+                )
+            else:
+                response = cloudinary.uploader.upload(file.file, timeout=UPLOAD_TIMEOUT)
+            return response.get("secure_url")
+        except NON_RETRYABLE_ERRORS as e:
+            raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
+        except Exception as e:
+            if attempt == attempts:
+                raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
+            time.sleep(0.5 * attempt)
+
+
+def upload_image_files(files: list[UploadFile]) -> list[str]:
+    """
+    Upload nhiều ảnh song song (tối đa BATCH_UPLOAD_CONCURRENCY cùng lúc) và trả về
+    URL theo đúng thứ tự của `files`. Mỗi ảnh vẫn có timeout/thử lại như upload_image_file.
     """
-    try:
-        # Cloudinary có thể đọc trực tiếp file-like object từ FastAPI
-        response = cloudinary.uploader.upload(file.file)
-        return response.get("secure_url")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Image upload failed: {str(e)}")
\ No newline at end of file
+    if len(files) <= 1:
+        return [upload_image_file(f) for f in files]
+    with ThreadPoolExecutor(max_workers=min(BATCH_UPLOAD_CONCURRENCY, len(files))) as pool:
+        return list(pool.map(upload_image_file, files))
@@ -29,6 +29,13 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str
     CLOUDINARY_API_SECRET: str
 
+    # Gửi lời chào chatbot từng đoạn (hiệu ứng gõ chữ); False = gửi liền, không chờ
+    GREETING_TYPEWRITER_EFFECT: bool = True
+
+    # Chat websocket: số giây client được im lặng trước khi bị ping, và thời gian chờ trả lời ping
+    WS_IDLE_TIMEOUT: int = 300
+    WS_PING_GRACE: int = 30
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,24 +1,36 @@
+import logging
 from datetime import datetime, timedelta
+from threading import Lock
 from typing import Optional
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Request, Depends
 from fastapi.security import OAuth2PasswordBearer
 import os
 from dotenv import load_dotenv
-from app.models.schemas import TokenData
+from app.models.schemas import TokenData, UserClaims
 from app.models.database import get_db
-from app.models.entities import Users
-from sqlalchemy.orm import Session, joinedload
+from app.models.entities import ConsultantProfile, ContentManagerProfile, Permission, UserPermission, Users
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # JWT Configuration from .env
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
+# Token có perms vẫn được đối chiếu với DB (trạng thái tài khoản + quyền) sau tối đa
+# ACCESS_CHECK_TTL giây: tài khoản bị khoá hoặc đổi quyền thì token cũ hết hiệu lực
+ACCESS_CHECK_TTL = 30
+_access_cache = TTLCache(maxsize=10_000, ttl=ACCESS_CHECK_TTL)
+_access_lock = Lock()
+
 # Password hashing
 pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt_sha256", "bcrypt"], deprecated="auto")
 
@@ -59,6 +71,19 @@ def verify_token(token: str) -> TokenData:
         )
 
 
+def build_token_claims(user: Users) -> dict:
+    """
+    Claims issued at login so permission checks can run from the token alone.
+    """
+    return {
+        "sub": user.email,
+        "user_id": user.user_id,
+        "role": user.role.role_name if user.role else None,
+        "perms": [p.permission_name for p in user.permissions if p.permission_name],
+        "consultant_leader": bool(user.consultant_profile and user.consultant_profile.is_leader),
+        "content_manager_leader": bool(user.content_manager_profile and user.content_manager_profile.is_leader),
+    }
+
 def verify_user_access(requesting_user_id: int, target_user_id: int):
     """
     Verify if the requesting user has access to view the target user's profile
@@ -69,17 +94,42 @@ def verify_user_access(requesting_user_id: int, target_user_id: int):
             detail="You don't have permission to access this profile"
         )
 
+def get_permission_names(user) -> frozenset:
+    """
+    Lower-cased permission names of the user, computed once and memoized on the
+    user object (the current user lives for a single request).
+    """
+    names = getattr(user, "_permission_names", None)
+    if names is None:
+        names = frozenset(p.permission_name.lower() for p in (user.permissions or []) if p.permission_name)
+        user._permission_names = names
+    return names
+
 def is_admin(user: Users) -> bool:
     """
     Check if user is admin based on permission (not role).
     Admin has full permissions.
     """
-    if not user or not user.permissions:
+    if not user:
         return False
     
     # Check if user has "admin" permission
-    permission_names = {p.permission_name.lower() for p in user.permissions if p.permission_name}
-    return "admin" in permission_names
+    return "admin" in get_permission_names(user)
+
+def is_content_role(user: Users) -> bool:
+    """
+    Check if user is admin or holds any content permission
+    ("content_manager", "content manager", "Content Manager", ...).
+    Memoized on the user object like get_permission_names.
+    """
+    if not user:
+        return False
+
+    result = getattr(user, "_is_content_role", None)
+    if result is None:
+        result = is_admin(user) or any("content" in name for name in get_permission_names(user))
+        user._is_content_role = result
+    return result
 
 def has_permission(user: Users, permission_name: str) -> bool:
     """
@@ -101,17 +151,32 @@ def has_permission(user: Users, permission_name: str) -> bool:
         return True
     
     # Check if user has the specific permission
-    if not user.permissions:
-        return False
-    
-    permission_names = {p.permission_name.lower() for p in user.permissions if p.permission_name}
-    return permission_name.lower() in permission_names
+    return permission_name.lower() in get_permission_names(user)
 
 def is_admin_or_admission_official(user: Users) -> bool:
     """Check if user is an admin or an admission official."""
     if not user:
         return False
-    return has_permission(user, "Admin") or has_permission(user, "Admission Official")
+    # has_permission already lets admins through
+    return has_permission(user, "Admission Official")
+
+_ADMIN_OR_CONSULTANT = frozenset({"admin", "consultant"})
+
+def can_view_knowledge(user: Users) -> bool:
+    """
+    Check if user may view intents / training Q&A / documents:
+    admin, consultant, or any admission permission ("Admission Official", ...).
+    Memoized on the user object like get_permission_names.
+    """
+    if not user:
+        return False
+
+    result = getattr(user, "_can_view_knowledge", None)
+    if result is None:
+        names = get_permission_names(user)
+        result = bool(names & _ADMIN_OR_CONSULTANT) or any("admission" in name for name in names)
+        user._can_view_knowledge = result
+    return result
 
 def verify_content_manager(user: Users) -> bool:
     """
@@ -122,11 +187,7 @@ def verify_content_manager(user: Users) -> bool:
     if not user:
         return False
     
-    # Admin has full access
-    if is_admin(user):
-        return True
-    
-    # Check for content manager permission
+    # Check for content manager permission (admins pass inside has_permission)
     return has_permission(user, "Content Manager")
 
 def verify_content_manager_leader(user: Users) -> bool:
@@ -134,21 +195,22 @@ def verify_content_manager_leader(user: Users) -> bool:
     Verify if user is a content manager leader or admin.
     Checks if user has content_manager permission AND is_leader flag is true.
     Admin role bypasses this check.
+    Memoized on the user object like get_permission_names.
     """
     if not user:
         return False
-    
-    # Admin has full access (bypass leader check)
-    if is_admin(user):
-        return True
-    
-    # Check if user has content_manager permission
-    if not has_permission(user, "Content Manager"):
-        return False
-    
-    # Check if is_leader flag is set
-    return (user.content_manager_profile and 
-            user.content_manager_profile.is_leader)
+
+    result = getattr(user, "_is_content_manager_leader", None)
+    if result is None:
+        # Admin has full access (bypass leader check); otherwise needs the
+        # content_manager permission AND the is_leader flag
+        result = is_admin(user) or bool(
+            has_permission(user, "Content Manager")
+            and user.content_manager_profile
+            and user.content_manager_profile.is_leader
+        )
+        user._is_content_manager_leader = result
+    return result
 
 def verify_consultant(user: Users) -> bool:
     """
@@ -158,76 +220,164 @@ def verify_consultant(user: Users) -> bool:
     if not user:
         return False
     
-    # Admin has full access
-    if is_admin(user):
-        return True
-    
-    # Check for consultant permission
+    # Check for consultant permission (admins pass inside has_permission)
     return has_permission(user, "consultant")
 
 def verify_consultant_leader(user: Users) -> bool:
     """
     Verify if user is a consultant leader or admin.
     Checks if user has consultant permission AND is_leader flag is true.
+    Memoized on the user object like get_permission_names.
     """
     if not user:
         return False
-    
-    # Admin has full access (bypass leader check)
-    if is_admin(user):
-        return True
-    
-    # Check if user has consultant permission
-    if not has_permission(user, "consultant"):
-        return False
-    
-    # Check if is_leader flag is set
-    return (user.consultant_profile and 
-            user.consultant_profile.is_leader)
 
-async def get_current_user(request: Request, db: Session = Depends(get_db)) -> Optional[Users]:
+    result = getattr(user, "_is_consultant_leader", None)
+    if result is None:
+        # Admin has full access (bypass leader check); otherwise needs the
+        # consultant permission AND the is_leader flag
+        result = is_admin(user) or bool(
+            has_permission(user, "consultant")
+            and user.consultant_profile
+            and user.consultant_profile.is_leader
+        )
+        user._is_consultant_leader = result
+    return result
+
+# Everything the permission helpers read from a Users object: the many-to-ones ride in the
+# user SELECT, permissions (many-to-many) come in one extra SELECT ... IN
+CURRENT_USER_LOADS = (
+    selectinload(Users.permissions),
+    joinedload(Users.role),
+    joinedload(Users.consultant_profile),
+    joinedload(Users.content_manager_profile),
+)
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> Optional[Users]:
     """
     Get current user from token in Authorization header.
     Returns None if no token is provided or token is invalid.
     """    
     auth_header = request.headers.get("Authorization")
-    print(f"DEBUG: Auth header received: {auth_header}")
     
     if not auth_header or "Bearer" not in auth_header:
-        print("DEBUG: No Authorization header or Bearer not found")
         return None
         
     try:
         token = auth_header.split(" ")[1]
-        print(f"DEBUG: Token extracted: {token[:20]}...")
         
         token_data = verify_token(token)
         if token_data.email is None:
-            print("DEBUG: Token verification failed - no email")
             return None
             
-        print(f"DEBUG: Token verified for email: {token_data.email}")
-            
-        # Load user with permissions, role, and consultant_profile relationships eagerly loaded
-        from sqlalchemy.orm import selectinload
-        user = db.query(Users).options(
-            selectinload(Users.permissions),
-            selectinload(Users.role),
-            selectinload(Users.consultant_profile)
-        ).filter(Users.email == token_data.email).first()
-        
-        print(f"DEBUG: Found user: {user.email if user else 'None'}")
-        
-        if user:
-            print(f"DEBUG: Loaded {len(user.permissions)} permissions for user {user.user_id}")
-            for perm in user.permissions:
-                print(f"DEBUG: Permission: {perm.permission_name}")
+        # Load user with permissions, role and profiles eagerly loaded.
+        # Primary-key lookup when the token carries user_id (identity map, cached statement).
+        if token_data.user_id is not None:
+            user = db.get(Users, token_data.user_id, options=CURRENT_USER_LOADS)
+            if user is not None and user.email != token_data.email:
+                user = None
+        else:
+            user = db.query(Users).options(*CURRENT_USER_LOADS).filter(
+                Users.email == token_data.email
+            ).first()
         
         if user is None or not user.status:
-            print("DEBUG: User not found or inactive")
+            logger.debug("User not found or inactive: %s", token_data.email)
             return None
             
         return user
     except (JWTError, Exception) as e:
-        print(f"DEBUG: Exception in get_current_user: {e}")
+        logger.debug("Exception in get_current_user: %s", e)
+        return None
+
+def _access_fingerprint(perms, consultant_leader, content_manager_leader) -> tuple:
+    """Everything build_token_claims puts in a token that the permission helpers read."""
+    return frozenset(perms), bool(consultant_leader), bool(content_manager_leader)
+
+def _load_user_access(db: Session, user_id: int) -> Optional[tuple]:
+    """(email, status, fingerprint) of the user in one query, or None if the user is gone."""
+    rows = db.execute(
+        select(
+            Users.email,
+            Users.status,
+            Permission.permission_name,
+            ConsultantProfile.is_leader,
+            ContentManagerProfile.is_leader,
+        )
+        .select_from(Users)
+        .outerjoin(UserPermission, UserPermission.user_id == Users.user_id)
+        .outerjoin(Permission, Permission.permission_id == UserPermission.permission_id)
+        .outerjoin(ConsultantProfile, ConsultantProfile.consultant_id == Users.user_id)
+        .outerjoin(ContentManagerProfile, ContentManagerProfile.content_manager_id == Users.user_id)
+        .where(Users.user_id == user_id)
+    ).all()
+    if not rows:
+        return None
+    email, user_status, _, consultant_leader, content_manager_leader = rows[0]
+    perms = [row[2] for row in rows if row[2]]
+    return email, bool(user_status), _access_fingerprint(perms, consultant_leader, content_manager_leader)
+
+def invalidate_user_access(user_id: int):
+    """Drop the cached access state after a ban/unban or a permission change."""
+    with _access_lock:
+        _access_cache.pop(user_id, None)
+
+def token_access_valid(db: Session, payload: dict) -> bool:
+    """
+    Revocation check for tokens that carry perms: the user must still exist, be active
+    and hold exactly the permissions/leader flags embedded in the token.
+    """
+    user_id = payload["user_id"]
+    with _access_lock:
+        access = _access_cache.get(user_id)
+    if access is None:
+        access = _load_user_access(db, user_id)
+        if access is None:
+            return False
+        with _access_lock:
+            _access_cache[user_id] = access
+
+    email, user_status, fingerprint = access
+    token_fingerprint = _access_fingerprint(
+        payload["perms"],
+        payload.get("consultant_leader", False),
+        payload.get("content_manager_leader", False),
+    )
+    return user_status and email == payload["sub"] and fingerprint == token_fingerprint
+
+def get_current_user_claims(request: Request, db: Session = Depends(get_db)):
+    """
+    Get current user from the access-token claims; the DB is only read for the
+    revocation check (token_access_valid), at most once per ACCESS_CHECK_TTL per user.
+    Returns a UserClaims object that works with is_admin/has_permission/verify_*.
+    Returns None for inactive users or tokens whose permissions are out of date.
+    Tokens issued before permissions were embedded fall back to get_current_user.
+    Returns None if no token is provided or token is invalid.
+    """
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or "Bearer" not in auth_header:
         return None
+
+    try:
+        token = auth_header.split(" ")[1]
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except (JWTError, IndexError):
+        return None
+
+    if payload.get("sub") is None or payload.get("user_id") is None:
+        return None
+
+    if "perms" not in payload:
+        return get_current_user(request, db)
+
+    if not token_access_valid(db, payload):
+        return None
+
+    return UserClaims(
+        user_id=payload["user_id"],
+        email=payload["sub"],
+        role_name=payload.get("role"),
+        permissions=[{"permission_name": name} for name in payload["perms"]],
+        consultant_profile={"is_leader": payload.get("consultant_leader", False)},
+        content_manager_profile={"is_leader": payload.get("content_manager_leader", False)},
+    )
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
@@ -24,12 +25,49 @@ from app.api.routes import (
     analytics_controller
 )
 from app.models.database import init_db
+from app.services.faq_stats import faq_stats
+from app.services.training_service import TrainingService, search_pool
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
+import logging
 import os
+import queue
+
+# Log của app đi qua QueueHandler: event loop chỉ đẩy record vào queue, thread của
+# QueueListener mới ghi ra stdout. LOG_LEVEL=DEBUG để xem log từng lượt chat.
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream)
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # chỉ ghép args, format đầy đủ ở listener
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), handlers=[_log_queue_handler])
+logger = logging.getLogger(__name__)
 
 # OAuth2 scheme for Swagger UI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _log_listener.start()
+    init_db()
+    # Một TrainingService cho cả app (xem get_training_service)
+    app.state.training_service = TrainingService()
+    # Ghi FaqStatistics theo batch; cancel lúc tắt app sẽ ghi nốt phần còn lại
+    faq_flusher = asyncio.create_task(faq_stats.run())
+    yield
+    faq_flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await faq_flusher
+    service = app.state.training_service
+    logger.info("Query embedding cache: %s", service.embed_cache_info())
+    service.qdrant_client.close()
+    await service.async_qdrant_client.close()
+    search_pool.shutdown(wait=False)
+    _log_listener.stop()
+
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     # Add security scheme for Swagger docs
@@ -83,6 +121,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Add exception handler to ensure CORS headers are always present
@@ -112,10 +151,6 @@ async def internal_server_error_handler(request: Request, exc: Exception):
     response.headers["Access-Control-Allow-Credentials"] = "true"
     return response
 
-async def startup_event():
-    init_db()
-app.add_event_handler("startup",startup_event)
-
 
 app.include_router(live_chat_controller.router, prefix="/live_chat")
 app.include_router(auth_controller.router, prefix="/auth", tags=["Authentication"])
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.orm import sessionmaker
 from app.models.entities import Base
 import os
@@ -8,7 +8,19 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Sized for FastAPI's threadpool: sync endpoints each hold a session for the whole request.
+# Only QueuePool takes these options; SQLite (dev/tests) keeps SQLAlchemy's default pool
+POOL_OPTIONS = dict(
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_use_lifo=True,
+)
+engine = create_engine(
+    DATABASE_URL,
+    **({} if make_url(DATABASE_URL).get_backend_name() == "sqlite" else POOL_OPTIONS),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -18,5 +30,27 @@ def get_db():
     finally:
         db.close()
 
+# Columns added to tables that already exist in production (create_all never alters tables)
+ADDED_COLUMNS = (
+    'ALTER TABLE "KnowledgeBaseDocument" ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)',
+)
+
+# Article indexes superseded by the (status|created_by, create_at, article_id) ones in entities.py
+RETIRED_INDEXES = (
+    'DROP INDEX IF EXISTS "ix_article_status_createdby"',
+    'DROP INDEX IF EXISTS "ix_article_published"',
+)
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # ADD COLUMN IF NOT EXISTS is PostgreSQL syntax; a fresh SQLite dev DB gets it from create_all
+        if engine.dialect.name == "postgresql":
+            for statement in ADDED_COLUMNS:
+                conn.execute(text(statement))
+        for statement in RETIRED_INDEXES:
+            conn.execute(text(statement))
+    # create_all skips tables that already exist, so add any new indexes explicitly
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import datetime
 from sqlalchemy import (
-    Column, Integer, String, Boolean, Date, Float, ForeignKey, Text
+    Column, Integer, String, Boolean, Date, Float, ForeignKey, Text, Index, text, func
 )
 from datetime import datetime
 from sqlalchemy.orm import relationship, declarative_base
@@ -410,6 +410,18 @@ class KnowledgeBaseDocument(Base):
     reviewed_by = Column(Integer, ForeignKey('Users.user_id'), nullable=True)
     reviewed_at = Column(Date, nullable=True)
     reject_reason = Column(String, nullable=True)
+    # SHA-256 (hex) of the uploaded file, used to short-circuit re-uploads of the same file
+    content_hash = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        # Rejected documents may be uploaded again, so only live ones must be unique
+        # (partial index on both PostgreSQL and SQLite dev databases)
+        Index(
+            "ix_kbdoc_content_hash", "content_hash", unique=True,
+            postgresql_where=text("status IN ('draft', 'approved')"),
+            sqlite_where=text("status IN ('draft', 'approved')"),
+        ),
+    )
     
     intent = relationship('Intent', back_populates='document')
     # Relationships
@@ -486,12 +498,37 @@ class Article(Base):
     note = Column(String)
     # content = Column(Text)
     status = Column(String, default="draft")  # Values: draft, published, rejected, cancelled
-    create_at = Column(Date, default=datetime.now)
+    # Date comes from the database (CURRENT_DATE inlined in the INSERT) rather than the app clock
+    create_at = Column(Date, default=func.current_date(), server_default=func.current_date())
     created_by = Column(Integer, ForeignKey("Users.user_id"))
     major_id = Column(Integer, ForeignKey('Major.major_id'), nullable=True)
     specialization_id = Column(Integer, ForeignKey('Specialization.specialization_id'), nullable=True)
 
+    __table_args__ = (
+        # Lists are filtered by status and ordered by (create_at, article_id) desc (see paginate);
+        # a btree scanned backwards serves the ORDER BY ... LIMIT without a sort
+        Index("ix_article_status_createat", "status", "create_at", "article_id"),
+        # get_articles_by_user: equality on created_by, then the paginate() ordering;
+        # status != 'deleted' is filtered on the few rows per author
+        Index("ix_article_createdby_createat", "created_by", "create_at", "article_id"),
+        # Review queue: drafts are a small slice of the table
+        Index("ix_article_draft", "create_at", "article_id", postgresql_where=text("status = 'draft'")),
+    )
+
     # Relationships
     author_user = relationship('Users', back_populates='articles')
     major = relationship('Major', back_populates='articles')
     specialization = relationship('Specialization', back_populates='articles')
+
+    # Calculated fields used by ArticleResponse
+    @property
+    def author_name(self):
+        return self.author_user.full_name if self.author_user else None
+
+    @property
+    def major_name(self):
+        return self.major.major_name if self.major else None
+
+    @property
+    def specialization_name(self):
+        return self.specialization.specialization_name if self.specialization else None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional, List
 from datetime import date
 
@@ -14,6 +14,33 @@ class TokenData(BaseModel):
     user_id: Optional[int] = None
 
 
+class PermissionClaim(BaseModel):
+    permission_name: str
+
+
+class LeaderClaim(BaseModel):
+    is_leader: bool = False
+
+
+class UserClaims(BaseModel):
+    """
+    Current user rebuilt from access-token claims (no ORM load, see get_current_user_claims).
+    Mirrors the Users attributes read by the permission helpers in app.core.security.
+    """
+    user_id: int
+    email: str
+    role_name: Optional[str] = None
+    permissions: List[PermissionClaim] = []
+    consultant_profile: Optional[LeaderClaim] = None
+    content_manager_profile: Optional[LeaderClaim] = None
+
+    # Memoized permission checks (see app.core.security.get_permission_names)
+    _permission_names: Optional[frozenset] = None
+    _is_content_role: Optional[bool] = None
+    _is_content_manager_leader: Optional[bool] = None
+    _is_consultant_leader: Optional[bool] = None
+
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -408,8 +435,9 @@ class SpecializationResponse(BaseModel):
     major_id: Optional[int]
     articles: List['ArticleResponse'] = []
 
-    class Config:
-        orm_mode = True
+    # Validated straight from Specialization objects; the nested articles go
+    # through ArticleResponse's from_attributes in the same pass
+    model_config = ConfigDict(from_attributes=True)
 
 # ================= ARTICLE =================
 
@@ -451,10 +479,11 @@ class ArticleResponse(BaseModel):
     author_name: Optional[str] = None
     major_name: Optional[str] = None
     specialization_name: Optional[str] = None
-    note: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    # Read straight from Article objects (author_name/major_name/specialization_name
+    # are properties on the model) when nested in SpecializationResponse. The article
+    # endpoints themselves return projected rows and skip validation.
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ================= RECOMMENDATION =================
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from threading import Lock
+from typing import Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.models.database import SessionLocal
+from app.models.entities import FaqStatistics
+
+logger = logging.getLogger(__name__)
+
+# Giây giữa 2 lần ghi buffer xuống DB
+FAQ_FLUSH_INTERVAL = 10
+
+
+class FaqStatsBuffer:
+    """
+    Gom các dòng FaqStatistics của luồng chat và ghi bằng một INSERT nhiều dòng mỗi
+    FAQ_FLUSH_INTERVAL giây, thay vì SELECT kiểm tra + INSERT + commit sau mỗi câu trả lời.
+    record() chỉ thêm vào list trong RAM nên gọi được ngay trên event loop.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._rows: list = []
+
+    def record(self, intent_id: int, response_from_chat_id: Optional[int] = None, query_from_user_id: Optional[int] = None):
+        with self._lock:
+            self._rows.append({
+                "response_from_chat_id": response_from_chat_id,
+                "query_from_user_id": query_from_user_id,
+                "intent_id": intent_id,
+            })
+
+    def flush(self) -> int:
+        """Ghi mọi dòng đang chờ trong một transaction; trả về số dòng đã ghi."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        db = SessionLocal()
+        try:
+            db.execute(insert(FaqStatistics), rows)
+            db.commit()
+            return len(rows)
+        except IntegrityError:
+            # Một dòng lỗi khóa ngoại (session/intent đã bị xóa trước khi flush) không được
+            # kéo theo cả batch: ghi lại từng dòng, chỉ bỏ các dòng lỗi
+            db.rollback()
+            return self._insert_one_by_one(db, rows)
+        except Exception as e:
+            db.rollback()
+            logger.error("Error updating FaqStatistics (%d rows dropped): %s", len(rows), e)
+            return 0
+        finally:
+            db.close()
+
+    @staticmethod
+    def _insert_one_by_one(db, rows) -> int:
+        written = 0
+        for row in rows:
+            try:
+                db.execute(insert(FaqStatistics), [row])
+                db.commit()
+                written += 1
+            except IntegrityError as e:
+                db.rollback()
+                logger.warning("Skipping FaqStatistics row %s: %s", row, e.orig)
+            except Exception as e:
+                db.rollback()
+                logger.error("Error updating FaqStatistics (%d rows dropped): %s", len(rows) - written, e)
+                break
+        return written
+
+    async def run(self, interval: float = FAQ_FLUSH_INTERVAL):
+        """Vòng ghi định kỳ, chạy như một task trong lifespan của app."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await asyncio.to_thread(self.flush)
+        finally:
+            # App tắt (task bị cancel) → ghi nốt phần còn lại
+            await asyncio.to_thread(self.flush)
+
+
+faq_stats = FaqStatsBuffer()
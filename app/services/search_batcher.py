@@ -0,0 +1,87 @@
+from concurrent.futures import Future
+from threading import Lock
+import time
+from typing import List, Optional
+from qdrant_client import models
+from qdrant_client.models import ScoredPoint
+
+
+class SearchBatcher:
+    """
+    Gom các vector search vào cùng một Qdrant collection thành một lần search_batch.
+
+    Các lượt chat chạy song song gọi search() từ threadpool. Thread đầu tiên của một đợt
+    làm "leader": chờ `window_ms` để các thread khác kịp xếp query vào, rồi gửi một request
+    search_batch cho cả đợt và trả kết quả về từng Future. Không cần thread nền riêng.
+    window_ms = 0 thì search thẳng như trước. search_params (vd. tham số quantization)
+    được gửi kèm mọi query.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        window_ms: float = 5,
+        max_batch: int = 32,
+        search_params: Optional[models.SearchParams] = None,
+    ):
+        self.collection_name = collection_name
+        self.window_ms = window_ms
+        self.search_params = search_params
+        self.max_batch = max_batch
+        self._lock = Lock()
+        self._pending: list = []
+        self._leader_waiting = False
+
+    def search(self, qdrant_client, q_vec, top_k: int) -> List[ScoredPoint]:
+        """Top-k points cho q_vec, best first (giống qdrant_client.search)."""
+        if self.window_ms <= 0:
+            return qdrant_client.search(
+                collection_name=self.collection_name,
+                query_vector=q_vec,
+                limit=top_k,
+                search_params=self.search_params,
+            )
+
+        request = models.SearchRequest(
+            vector=list(q_vec), limit=top_k, with_payload=True, params=self.search_params
+        )
+        future = Future()
+        with self._lock:
+            self._pending.append((request, future))
+            is_leader = not self._leader_waiting
+            if is_leader:
+                self._leader_waiting = True
+
+        if is_leader:
+            time.sleep(self.window_ms / 1000)
+            with self._lock:
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+                # Query còn dư (đợt quá đông) → thread kế tiếp vào sẽ làm leader của đợt sau
+                self._leader_waiting = False
+            self._run(qdrant_client, batch)
+            if self._pending:
+                self._drain(qdrant_client)
+        return future.result()
+
+    def _drain(self, qdrant_client):
+        while True:
+            with self._lock:
+                if self._leader_waiting or not self._pending:
+                    return
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self._run(qdrant_client, batch)
+
+    def _run(self, qdrant_client, batch):
+        if not batch:
+            return
+        try:
+            results = qdrant_client.search_batch(
+                collection_name=self.collection_name,
+                requests=[request for request, _ in batch],
+            )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), points in zip(batch, results):
+            future.set_result(points)
@@ -0,0 +1,164 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Two-tier semantic cache in front of hybrid_search, matched by cosine similarity.
+
+    - Static tier: approved training Q&A (question embedding -> official answer),
+      loaded from the Qdrant training_qa collection and read-only afterwards.
+    - Dynamic tier: recent (enriched query embedding -> official training Q&A answer)
+      written after a miss, fixed capacity with LRU eviction. Only answers that do not
+      depend on the chat session may be added; a hit is still rephrased per session.
+
+    Vectors are L2-normalized on the way in, so a dot product is the cosine similarity.
+    Payloads are dicts: {"answer", "sources", "confidence", "intent_id"}.
+
+    The static tier is (re)loaded lazily by lookup() from the collection given to
+    set_source(). invalidate() bumps a generation counter, so a load that was already
+    scrolling when the collection changed is discarded instead of installed.
+    """
+
+    def __init__(self, threshold: float = 0.92, capacity: int = 512):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._lock = Lock()
+        # Only one thread scrolls Qdrant at a time; the others skip the static tier meanwhile
+        self._load_lock = Lock()
+        self._generation = 0
+        self._source = None
+        # Static tier
+        self._static_mat: Optional[np.ndarray] = None
+        self._static_payloads: List[Dict[str, Any]] = []
+        self.static_loaded = False
+        # Dynamic tier: rows of a preallocated matrix, slot order = LRU order
+        self._dyn_mat: Optional[np.ndarray] = None
+        self._dyn_payloads: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._dyn_lru: "OrderedDict[int, None]" = OrderedDict()
+        self._dyn_free = list(range(capacity - 1, -1, -1))
+
+    @staticmethod
+    def _normalize(vec) -> np.ndarray:
+        v = np.asarray(vec, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def set_source(self, qdrant_client, collection_name: str):
+        """Collection the static tier is loaded from (the training Q&A collection)."""
+        self._source = (qdrant_client, collection_name)
+
+    def load_static(self, qdrant_client, collection_name: str, batch_size: int = 256):
+        """(Re)load the static tier from every point of the training Q&A collection."""
+        with self._lock:
+            generation = self._generation
+        vectors, payloads = [], []
+        offset = None
+        while True:
+            points, offset = qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for p in points:
+                vectors.append(p.vector)
+                payloads.append({
+                    "answer": p.payload.get("answer_text"),
+                    "sources": [p.payload.get("question_text")],
+                    "confidence": 1.0,
+                    "intent_id": p.payload.get("intent_id"),
+                })
+            if offset is None:
+                break
+
+        mat = None
+        if vectors:
+            mat = np.asarray(vectors, dtype=np.float32)
+            mat /= np.maximum(np.linalg.norm(mat, axis=1, keepdims=True), 1e-12)
+        with self._lock:
+            if generation != self._generation:
+                # invalidate() ran during the scroll: this snapshot may hold deleted Q&A
+                return
+            self._static_mat = mat
+            self._static_payloads = payloads
+            self.static_loaded = True
+
+    def _ensure_static(self):
+        if self.static_loaded or self._source is None:
+            return
+        if not self._load_lock.acquire(blocking=False):
+            return
+        try:
+            if not self.static_loaded:
+                self.load_static(*self._source)
+        except Exception as e:
+            logger.error("Error loading semantic cache static tier: %s", e)
+        finally:
+            self._load_lock.release()
+
+    def invalidate(self):
+        """
+        Called when approved Q&A/documents change: drop the dynamic tier and
+        reload the static tier on next use.
+        """
+        with self._lock:
+            self._generation += 1
+            self.static_loaded = False
+            self._static_mat = None
+            self._static_payloads = []
+            self._dyn_payloads = [None] * self.capacity
+            self._dyn_lru.clear()
+            self._dyn_free = list(range(self.capacity - 1, -1, -1))
+            if self._dyn_mat is not None:
+                self._dyn_mat[:] = 0
+
+    def lookup(self, q_vec) -> Optional[Dict[str, Any]]:
+        """Best payload whose similarity to q_vec is >= threshold, static tier first."""
+        self._ensure_static()
+        q = self._normalize(q_vec)
+        with self._lock:
+            if self._static_mat is not None and self._static_mat.shape[1] == q.shape[0]:
+                sims = self._static_mat @ q
+                i = int(np.argmax(sims))
+                if sims[i] >= self.threshold:
+                    return self._static_payloads[i]
+
+            if self._dyn_lru and self._dyn_mat.shape[1] == q.shape[0]:
+                # Free slots are zero rows (similarity 0), so no mask is needed
+                sims = self._dyn_mat @ q
+                i = int(np.argmax(sims))
+                if sims[i] >= self.threshold and i in self._dyn_lru:
+                    self._dyn_lru.move_to_end(i)
+                    return self._dyn_payloads[i]
+        return None
+
+    def add(self, q_vec, answer: str, sources: list, confidence: float, intent_id: Optional[int]):
+        """Store a session-independent answer in the dynamic tier, evicting the least recently used one."""
+        if not answer:
+            return
+        q = self._normalize(q_vec)
+        with self._lock:
+            if self._dyn_mat is None or self._dyn_mat.shape[1] != q.shape[0]:
+                self._dyn_mat = np.zeros((self.capacity, q.shape[0]), dtype=np.float32)
+            if self._dyn_free:
+                slot = self._dyn_free.pop()
+            else:
+                slot, _ = self._dyn_lru.popitem(last=False)
+            self._dyn_mat[slot] = q
+            self._dyn_payloads[slot] = {
+                "answer": answer,
+                "sources": sources,
+                "confidence": confidence,
+                "intent_id": intent_id,
+            }
+            self._dyn_lru[slot] = None
+
+
+# Dùng chung trong process (backend chạy 1 gunicorn worker)
+semantic_cache = SemanticCache()
@@ -0,0 +1,80 @@
+import re
+import unicodedata
+from typing import Optional
+from unidecode import unidecode
+
+# Chạy trước llm_document_recommendation_check: chỉ quyết định những câu rõ ràng,
+# còn lại trả về None để LLM kiểm tra như cũ. Mọi so khớp đều trên chữ thường và theo ranh
+# giới từ. Câu gõ có dấu được so với chủ đề có dấu; câu không dấu (người dùng hay gõ không
+# dấu) so với bản không dấu, trừ các cụm bỏ dấu thì trùng nghĩa khác.
+
+# Câu hỏi xin tư vấn cho bản thân → tầng recommendation
+RECOMMENDATION_PHRASES = [
+    "riasec", "holland",
+    "hop nganh nao", "hop voi nganh nao", "nen hoc nganh gi", "nen hoc nganh nao",
+    "nen hoc gi", "nen chon nganh",
+    "tu van cho toi", "tu van cho em", "tu van cho minh",
+    "phu hop voi toi", "phu hop voi em", "phu hop voi minh",
+]
+
+# Chủ đề tuyển sinh → tầng document, nhưng chỉ khi document tìm được cũng nói về đúng chủ đề đó
+DOCUMENT_TOPICS = [
+    "học phí", "ký túc xá", "học bổng", "điểm chuẩn", "chỉ tiêu",
+    "phương thức xét tuyển", "hồ sơ xét tuyển", "lệ phí",
+]
+
+# Bỏ dấu thì trùng cụm khác nghĩa ("chi tieu": "chỉ tiêu" tuyển sinh / "chi tiêu" tiền bạc):
+# chỉ nhận khi người dùng gõ có dấu, câu không dấu chứa cụm này luôn để LLM quyết định
+AMBIGUOUS_UNACCENTED = {"chi tieu"}
+
+# Document phải đủ gần câu hỏi thì mới bỏ qua LLM
+MIN_DOCUMENT_CONFIDENCE = 0.6
+
+
+def _phrase_pattern(phrases):
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, phrases)) + r")\b")
+
+
+def _lower(text: str) -> str:
+    # NFC: cùng một chữ có dấu có thể tới ở dạng tổ hợp (NFD)
+    return unicodedata.normalize("NFC", text or "").lower()
+
+
+def _normalize(text: str) -> str:
+    return unidecode(_lower(text))
+
+
+_RECOMMENDATION_RE = _phrase_pattern(RECOMMENDATION_PHRASES)
+_DOCUMENT_RE = _phrase_pattern([_lower(t) for t in DOCUMENT_TOPICS])
+_DOCUMENT_PLAIN_RE = _phrase_pattern(
+    [p for p in map(_normalize, DOCUMENT_TOPICS) if p not in AMBIGUOUS_UNACCENTED]
+)
+_AMBIGUOUS_RE = _phrase_pattern(sorted(AMBIGUOUS_UNACCENTED))
+
+
+def route_tier(query: str, context: str, confidence: float) -> Optional[str]:
+    """
+    "document" / "recommendation" when the query alone settles the tier, else None.
+    A query that matches both kinds of phrases is left to the LLM.
+    """
+    lowered = _lower(query)
+    q = unidecode(lowered)
+    if q != lowered:
+        # Có dấu: so khớp đúng chữ, cả ở câu hỏi lẫn context
+        pattern, normalize = _DOCUMENT_RE, _lower
+    elif _AMBIGUOUS_RE.search(q):
+        # Không dấu mà có cụm nhập nhằng: không đoán, để LLM quyết định
+        return None
+    else:
+        pattern, normalize = _DOCUMENT_PLAIN_RE, _normalize
+
+    wants_recommendation = _RECOMMENDATION_RE.search(q) is not None
+    topics = set(pattern.findall(normalize(query)))
+
+    if wants_recommendation and not topics:
+        return "recommendation"
+    if topics and not wants_recommendation and confidence >= MIN_DOCUMENT_CONFIDENCE:
+        found = set(pattern.findall(normalize(context)))
+        if topics <= found:
+            return "document"
+    return None
@@ -2,20 +2,61 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_text_splitters  import RecursiveCharacterTextSplitter
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from qdrant_client.models import Distance, VectorParams, PointStruct
 import os
 import uuid
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import time
+from cachetools import LRUCache, TTLCache
+from threading import Lock
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
 from app.models import schemas
 from app.models.entities import AcademicScore, ChatInteraction, ChatSession, DocumentChunk, FaqStatistics, KnowledgeBaseDocument, Major, ParticipateChatSession, RiasecResult, TrainingQuestionAnswer
 from app.models.database import SessionLocal
 from sqlalchemy.exc import SQLAlchemyError
+from app.services.faq_stats import faq_stats
 from app.services.memory_service import MemoryManager
+from app.services.search_batcher import SearchBatcher
+from app.services.semantic_cache import semantic_cache
+from app.services.vector_index import LocalVectorIndex
 from app.utils.document_processor import DocumentProcessor
 
 memory_service = MemoryManager()
+# Số query embedding giữ trong LRU (mỗi vector 3072 float)
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", 4096))
+# Cross-encoder rerank cho document search (tùy chọn). Ví dụ RERANKER_MODEL=BAAI/bge-reranker-v2-m3,
+# RERANKER_BACKEND=onnx, RERANKER_MODEL_FILE=onnx/model_qint8_avx512_vnni.onnx (bản int8 chạy CPU).
+# Không đặt RERANKER_MODEL = không rerank, giữ thứ tự theo vector score như trước.
+RERANKER_MODEL = os.getenv("RERANKER_MODEL")
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "torch")
+RERANKER_MODEL_FILE = os.getenv("RERANKER_MODEL_FILE")
+RERANK_CANDIDATES = 20  # số chunk lấy từ vector search trước khi rerank xuống top_k
+# Embed chunk khi duyệt document: mỗi request gửi EMBED_BATCH_SIZE chunk, tối đa EMBED_CONCURRENCY request song song
+EMBED_BATCH_SIZE = 64
+EMBED_CONCURRENCY = 4
+# Cửa sổ gom các Qdrant search đồng thời thành một search_batch (ms); 0 = search từng query
+SEARCH_BATCH_WINDOW_MS = float(os.getenv("SEARCH_BATCH_WINDOW_MS", 5))
+# Pool riêng cho phần search của mỗi tin nhắn chat (hybrid_search, index cục bộ, rerank), dùng chung
+# mọi websocket: không tranh slot với route sync/DB của Starlette và executor mặc định của event loop.
+# Tối thiểu 4 thread vì một lượt search còn chờ Qdrant và SearchBatcher cần nhiều query cùng lúc để gom
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", max(4, os.cpu_count() or 1)))
+search_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search")
+# Vector của documents collection được lượng tử hóa int8 (giữ trong RAM, ~1/4 dung lượng float32);
+# search trên bản int8 lấy dư oversampling lần rồi chấm lại bằng vector gốc (rescore)
+DOCUMENT_QUANTIZATION = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+DOCUMENT_SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0)
+)
+# Kết nối tới OpenAI được giữ keep-alive ~5s (mặc định của httpx): quá LLM_WARM_INTERVAL giây
+# không warm thì lượt chat sau mở lại kết nối (TCP + TLS) trong lúc đang search
+LLM_WARM_INTERVAL = 4
 
 class TrainingService:
     def __init__(self):
@@ -31,11 +72,130 @@ class TrainingService:
         )
         self.qdrant_client = QdrantClient(
             host=os.getenv("QDRANT_HOST", "localhost"),
-            port=int(os.getenv("QDRANT_PORT", 6333))
+            port=int(os.getenv("QDRANT_PORT", 6333)),
+            # gRPC (cổng 6334) khi chạy cùng network với Qdrant, xem docker-compose.yaml
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+        )
+        # Client async cho các search gọi thẳng từ event loop (asearch_documents)
+        self.async_qdrant_client = AsyncQdrantClient(
+            host=os.getenv("QDRANT_HOST", "localhost"),
+            port=int(os.getenv("QDRANT_PORT", 6333)),
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
         )
         self.training_qa_collection = "training_qa"
         self.documents_collection = "knowledge_base_documents"
+        # Bản sao trong RAM của document vectors (collection nhỏ): search_documents không cần gọi Qdrant
+        self.document_index = LocalVectorIndex(self.documents_collection)
+        # Search gửi tới Qdrant của nhiều lượt chat cùng lúc được gom theo collection
+        self.training_qa_search = SearchBatcher(self.training_qa_collection, window_ms=SEARCH_BATCH_WINDOW_MS)
+        self.document_search = SearchBatcher(
+            self.documents_collection, window_ms=SEARCH_BATCH_WINDOW_MS, search_params=DOCUMENT_SEARCH_PARAMS
+        )
+        # Query lặp lại (retry, hỏi lại, follow-up) không phải gọi embedding API lần nữa.
+        # Dùng chung cho embed_query (threadpool) và aembed_query (event loop) nên cần lock
+        self._embed_cache = LRUCache(maxsize=EMBED_CACHE_SIZE)
+        self._embed_lock = Lock()
+        self._embed_hits = self._embed_misses = 0
+        # Kết quả các bước LLM phân loại, theo hash của đầu vào (chỉ dùng trên event loop, không cần lock)
+        self._relevance_cache = TTLCache(maxsize=10_000, ttl=900)
+        self._tier_check_cache = TTLCache(maxsize=10_000, ttl=900)
+        self._llm_warmed_at = 0.0
+        self.reranker = self._load_reranker()
+        # Điểm rerank theo (hash query, hash chunk); search_documents chạy trong threadpool nên cần lock
+        self._rerank_scores = TTLCache(maxsize=50_000, ttl=900)
+        self._rerank_lock = Lock()
         self._init_collections()
+        # Tầng tĩnh của semantic cache nạp lười từ training QA collection (xem SemanticCache.lookup)
+        semantic_cache.set_source(self.qdrant_client, self.training_qa_collection)
+        # Nạp bản sao document vectors ở thread nền; trong lúc đó search đi thẳng tới Qdrant
+        self.document_index.start_load(self.qdrant_client)
+
+    @staticmethod
+    def _load_reranker():
+        if not RERANKER_MODEL:
+            return None
+        # Import muộn: torch/onnxruntime chỉ cần khi bật rerank
+        from sentence_transformers import CrossEncoder
+        model_kwargs = {"file_name": RERANKER_MODEL_FILE} if RERANKER_MODEL_FILE else None
+        return CrossEncoder(RERANKER_MODEL, backend=RERANKER_BACKEND, model_kwargs=model_kwargs)
+
+    def rerank_documents(self, query: str, results: list, top_k: int) -> list:
+        """Sắp xếp lại các chunk theo cross-encoder, giữ top_k (score của point vẫn là vector score)."""
+        if self.reranker is None or len(results) <= 1:
+            return results[:top_k]
+        query_key = self._cache_key(query)[0]
+        keys = [(query_key, self._cache_key(r.payload.get("chunk_text", ""))[0]) for r in results]
+        with self._rerank_lock:
+            scores = [self._rerank_scores.get(k) for k in keys]
+        missing = [i for i, sc in enumerate(scores) if sc is None]
+        if missing:
+            predicted = self.reranker.predict(
+                [(query, results[i].payload.get("chunk_text", "")) for i in missing]
+            )
+            with self._rerank_lock:
+                for i, sc in zip(missing, predicted):
+                    scores[i] = self._rerank_scores[keys[i]] = float(sc)
+        order = sorted(range(len(results)), key=lambda i: scores[i], reverse=True)
+        return [results[i] for i in order[:top_k]]
+
+    def _cached_embedding(self, text: str) -> Optional[tuple]:
+        with self._embed_lock:
+            vec = self._embed_cache.get(text)
+            if vec is None:
+                self._embed_misses += 1
+            else:
+                self._embed_hits += 1
+            return vec
+
+    def _store_embedding(self, text: str, vec) -> tuple:
+        # tuple: giá trị trong cache là bất biến, không bị caller sửa
+        vec = tuple(vec)
+        with self._embed_lock:
+            self._embed_cache[text] = vec
+        return vec
+
+    def embed_cache_info(self) -> dict:
+        with self._embed_lock:
+            return {"hits": self._embed_hits, "misses": self._embed_misses,
+                    "size": self._embed_cache.currsize, "maxsize": self._embed_cache.maxsize}
+
+    @staticmethod
+    def _cache_key(*texts: str) -> tuple:
+        return tuple(hashlib.blake2b((t or "").encode(), digest_size=16).digest() for t in texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embedding của một query tìm kiếm, qua LRU cache."""
+        vec = self._cached_embedding(text)
+        if vec is None:
+            vec = self._store_embedding(text, self.embeddings.embed_query(text))
+        return list(vec)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Như embed_query nhưng gọi embedding API bằng client async, không chiếm thread."""
+        vec = self._cached_embedding(text)
+        if vec is None:
+            vec = self._store_embedding(text, await self.embeddings.aembed_query(text))
+        return list(vec)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embedding của nhiều chunk, cùng thứ tự với texts. Chia thành các batch
+        EMBED_BATCH_SIZE và gửi song song (tối đa EMBED_CONCURRENCY) thay vì từng chunk một.
+        Chunk được xếp theo độ dài trước khi chia batch để mỗi batch gồm các chunk dài gần
+        bằng nhau (ít padding với embedder tự host), kết quả được trả về theo thứ tự ban đầu.
+        """
+        if not texts:
+            return []
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_texts = [texts[i] for i in order]
+        batches = [sorted_texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(sorted_texts), EMBED_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=min(EMBED_CONCURRENCY, len(batches))) as pool:
+            # map giữ thứ tự batch → ghép lại đúng thứ tự đã sắp
+            sorted_vectors = [vec for batch in pool.map(self.embeddings.embed_documents, batches) for vec in batch]
+        vectors = [None] * len(texts)
+        for k, i in enumerate(order):
+            vectors[i] = sorted_vectors[k]
+        return vectors
 
     def _init_collections(self):
         try:
@@ -49,10 +209,20 @@ class TrainingService:
         try:
             self.qdrant_client.create_collection(
                 collection_name=self.documents_collection,
-                vectors_config=VectorParams(size=3072, distance=Distance.COSINE)
+                vectors_config=VectorParams(size=3072, distance=Distance.COSINE),
+                quantization_config=DOCUMENT_QUANTIZATION
             )
         except:
-            pass
+            # Collection đã có từ trước: bật quantization tại chỗ (Qdrant tự build lại ở nền, không mất dữ liệu)
+            try:
+                info = self.qdrant_client.get_collection(self.documents_collection)
+                if info.config.quantization_config is None:
+                    self.qdrant_client.update_collection(
+                        collection_name=self.documents_collection,
+                        quantization_config=DOCUMENT_QUANTIZATION
+                    )
+            except:
+                pass
 
     def create_chat_session(self, user_id: int, session_type: str = "chatbot") -> int:
         """
@@ -248,10 +418,35 @@ class TrainingService:
         enriched_txt = (enriched.content or "").strip().splitlines()[0] if enriched else user_message
         return enriched_txt   
 
+    async def run_search(self, fn, *args):
+        """Chạy một bước search đồng bộ trên search_pool, trả kết quả về event loop."""
+        return await asyncio.get_running_loop().run_in_executor(search_pool, fn, *args)
+
+    async def warm_llm_connection(self):
+        """
+        Mở sẵn (hoặc giữ) kết nối HTTP tới OpenAI bằng một request nhẹ (GET model, không tốn token),
+        để lần gọi LLM kế tiếp không phải chờ bắt tay TCP/TLS. Lỗi được bỏ qua.
+        """
+        now = time.monotonic()
+        if now - self._llm_warmed_at < LLM_WARM_INTERVAL:
+            return
+        self._llm_warmed_at = now
+        try:
+            await self.llm.root_async_client.models.retrieve(self.llm.model_name)
+        except Exception:
+            pass
+
     # ---------------------------
     # LLM relevance check: ensure enriched_query actually matches the training QA
     # ---------------------------
     async def llm_relevance_check(self, enriched_query: str, matched_question: str, answer: str) -> bool:
+        key = self._cache_key(enriched_query, matched_question, answer)
+        cached = self._relevance_cache.get(key)
+        if cached is None:
+            cached = self._relevance_cache[key] = await self._llm_relevance_check(enriched_query, matched_question, answer)
+        return cached
+
+    async def _llm_relevance_check(self, enriched_query: str, matched_question: str, answer: str) -> bool:
         prompt = f"""
         Bạn là chuyên gia đánh giá giữa câu hỏi tìm kiếm, câu hỏi trong cơ sở dữ liệu và câu trả lời cho 1 hệ thống chat RAG tuyển sinh, hãy suy luận. 
 
@@ -269,6 +464,13 @@ class TrainingService:
         return ("đúng" in r) or ("true" in r) or (r.startswith("đúng")) or (r.startswith("true"))
 
     async def llm_document_recommendation_check(self, enriched_query: str, context: str) -> bool:
+        key = self._cache_key(enriched_query, context)
+        cached = self._tier_check_cache.get(key)
+        if cached is None:
+            cached = self._tier_check_cache[key] = await self._llm_document_recommendation_check(enriched_query, context)
+        return cached
+
+    async def _llm_document_recommendation_check(self, enriched_query: str, context: str) -> bool:
         prompt = f"""
         Bạn là hệ thống kiểm tra 2 tầng:
         - Tầng 1 là hệ thống kiểm tra mức độ liên quan giữa câu hỏi người dùng và nội dung trong Document Base (RAG) cho chatbot RAG tư vấn tuyển sinh.
@@ -394,27 +596,9 @@ class TrainingService:
             memory.save_context({"input": last_user_msg}, {"output": ""})
 
     def update_faq_statistics(self, db: Session, response_id: int, intent_id: int = 1):
-        
-        try:
-            response = db.query(ChatInteraction).filter(
-            ChatInteraction.interaction_id == response_id,
-            ChatInteraction.is_from_bot == True
-        ).first()
-
-            if not response:
-                raise ValueError("Chatbot response not found")
-
-            faq = FaqStatistics(
-                response_from_chat_id = response_id,
-                intent_id = intent_id
-            )
-            db.add(faq)
-            db.commit()
-
-        except Exception as e:
-            db.rollback()
-            print(f"Error updating FaqStatistics: {e}")
-            
+        # response_id là bot message vừa được insert cùng session → không cần SELECT kiểm tra lại;
+        # dòng thống kê được ghi theo batch (xem faq_stats)
+        faq_stats.record(intent_id, response_from_chat_id=response_id)
 
     async def stream_response_from_context(self, query: str, context: str, session_id: int, user_id: int, intent_id: int, message: str):
         db = SessionLocal()
@@ -843,26 +1027,7 @@ class TrainingService:
 
 
     def update_faq_statistics_for_query(self, db: Session, query_id: int, intent_id: int = 1):
-        
-        try:
-            response = db.query(ChatInteraction).filter(
-            ChatInteraction.interaction_id == query_id,
-            ChatInteraction.is_from_bot == False
-        ).first()
-
-            if not response:
-                raise ValueError("Chatbot response not found")
-
-            faq = FaqStatistics(
-                query_from_user_id = query_id,
-                intent_id = intent_id
-            )
-            db.add(faq)
-            db.commit()
-
-        except Exception as e:
-            db.rollback()
-            print(f"Error updating FaqStatistics: {e}")
+        faq_stats.record(intent_id, query_from_user_id=query_id)
 
     def create_training_qa(self, db: Session, intent_id: int, question: str, answer: str, created_by: int):
         qa = TrainingQuestionAnswer(
@@ -878,6 +1043,28 @@ class TrainingService:
 
         return qa
 
+    def create_training_qa_batch(self, db: Session, items: List[schemas.TrainingQuestionRequest], created_by: int) -> List[int]:
+        """Tạo nhiều training QA (draft) bằng một câu INSERT nhiều dòng, trả về question_id theo thứ tự items."""
+        if not items:
+            return []
+        question_ids = db.execute(
+            insert(TrainingQuestionAnswer)
+            .values([
+                dict(
+                    question=item.question,
+                    answer=item.answer,
+                    intent_id=item.intent_id,
+                    created_by=created_by,
+                    status="draft"
+                )
+                for item in items
+            ])
+            .returning(TrainingQuestionAnswer.question_id)
+        ).scalars().all()
+        db.commit()
+
+        return question_ids
+
     def approve_training_qa(self, db: Session, qa_id: int, reviewer_id: int):
         qa = db.query(TrainingQuestionAnswer).filter_by(question_id=qa_id).first()
         if not qa:
@@ -913,6 +1100,7 @@ class TrainingService:
         qa.approved_by = reviewer_id
         qa.approved_at = datetime.now().date()  # Convert datetime to date
         db.commit()
+        semantic_cache.invalidate()
 
         return {
             "postgre_question_id": qa.question_id,
@@ -943,16 +1131,18 @@ class TrainingService:
         # Xóa trong DB
         db.delete(qa)
         db.commit()
+        semantic_cache.invalidate()
 
         return {"deleted_question_id": qa_id}
 
-    def create_document(self, db: Session, title: str, file_path: str, intend_id: int, created_by: int):
+    def create_document(self, db: Session, title: str, file_path: str, intend_id: int, created_by: int, content_hash: Optional[str] = None):
         new_doc = KnowledgeBaseDocument(
             title=title,
             file_path=file_path,
             intend_id=intend_id,
             status="draft",
             created_by=created_by,
+            content_hash=content_hash,
         )
         db.add(new_doc)
         db.commit()
@@ -960,6 +1150,21 @@ class TrainingService:
 
         return new_doc
 
+    def find_document_by_hash(self, db: Session, content_hash: str):
+        """(document, chunk_count) của document draft/approved có cùng nội dung, hoặc (None, 0)."""
+        doc = (
+            db.query(KnowledgeBaseDocument)
+            .filter(
+                KnowledgeBaseDocument.content_hash == content_hash,
+                KnowledgeBaseDocument.status.in_(("draft", "approved")),
+            )
+            .first()
+        )
+        if not doc:
+            return None, 0
+        chunk_count = db.query(DocumentChunk).filter_by(document_id=doc.document_id).count()
+        return doc, chunk_count
+
     def approve_document(self, db: Session, document_id: int, reviewer_id: int, intent_id: int, metadata: dict = None):
 
         doc = db.query(KnowledgeBaseDocument).filter_by(document_id=document_id).first()
@@ -999,50 +1204,33 @@ class TrainingService:
         )
         chunks = text_splitter.split_text(content)
 
-        qdrant_ids = []
-
-        # --- Save chunks to DB & Qdrant ---
-        for i, chunk in enumerate(chunks):
-
-            # # Save DocumentChunk in DB
-            # db_chunk = DocumentChunk(
-            #     chunk_text=chunk,
-            #     document_id=document_id,
-            #     created_by=reviewer_id
-            # )
-            # db.add(db_chunk)
-            # db.flush()   # get chunk_id
-
-            # Embed
-            embedding = self.embeddings.embed_query(chunk)
-            point_id = str(uuid.uuid4())
-
-            # Push to Qdrant
-            self.qdrant_client.upsert(
-                collection_name="knowledge_base_documents",
-                points=[
-                    PointStruct(
-                        id=point_id,
-                        vector=embedding,
-                        payload={
-                            "document_id": document_id,
-                            "chunk_index": i,
-                            "chunk_text": chunk,
-                            "intent_id": intent_id,
-                            "metadata": metadata or {},
-                            "type": "document"
-                        }
-                    )
-                ]
+        # --- Embed tất cả chunk (theo batch, song song) rồi upsert một lần ---
+        embeddings = self.embed_documents(chunks)
+        points = [
+            PointStruct(
+                id=str(uuid.uuid4()),
+                vector=embedding,
+                payload={
+                    "document_id": document_id,
+                    "chunk_index": i,
+                    "chunk_text": chunk,
+                    "intent_id": intent_id,
+                    "metadata": metadata or {},
+                    "type": "document"
+                }
             )
-
-            qdrant_ids.append(point_id)
+            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+        ]
+        if points:
+            self.qdrant_client.upsert(collection_name="knowledge_base_documents", points=points)
 
         # update document status
         doc.status = "approved"
         doc.reviewed_by = reviewer_id
         doc.reviewed_at = datetime.now().date()  # Convert datetime to date
         db.commit()
+        semantic_cache.invalidate()
+        self.document_index.invalidate()
 
         return {
             "document_id": document_id,
@@ -1076,6 +1264,8 @@ class TrainingService:
         # Xóa document trong DB
         db.delete(doc)
         db.commit()
+        semantic_cache.invalidate()
+        self.document_index.invalidate()
 
         return {"deleted_document_id": document_id}
     
@@ -1171,6 +1361,7 @@ class TrainingService:
                 )
             ]
         )
+        semantic_cache.invalidate()
         
         return {
             "postgre_question_id": new_qa.question_id,
@@ -1179,7 +1370,7 @@ class TrainingService:
     
     
 
-    def search_documents(self, query: str, top_k: int = 5):
+    def search_documents(self, query: str, top_k: int = 5, q_vec: Optional[List[float]] = None):
         """
         Search documents (Fallback)
         
@@ -1191,22 +1382,46 @@ class TrainingService:
         Args:
             query: User question
             top_k: Số chunks (lower score → fallback)
+            q_vec: Embedding của query nếu đã tính sẵn (bỏ qua lần embed)
         
         Returns:
             List of document chunks
         """
         
-        query_embedding = self.embeddings.embed_query(query)
+        query_embedding = list(q_vec) if q_vec is not None else self.embed_query(query)
         
-        results = self.qdrant_client.search(
-            collection_name=self.documents_collection,
-            query_vector=query_embedding,
-            limit=top_k
-        )
+        # Có reranker: lấy nhiều ứng viên hơn rồi rerank xuống top_k, prompt LLM chỉ nhận top_k chunk tốt nhất
+        limit = max(top_k, RERANK_CANDIDATES) if self.reranker is not None else top_k
+        results = self.document_index.search(self.qdrant_client, query_embedding, limit)
+        if results is None:
+            # Bản sao trong RAM chưa nạp xong, hoặc collection quá lớn để giữ trong RAM
+            results = self.document_search.search(self.qdrant_client, query_embedding, limit)
         
-        return results
+        return self.rerank_documents(query, results, top_k)
     
-    def search_training_qa(self, query: str, top_k: int = 5):
+    async def asearch_documents(self, query: str, top_k: int = 5, q_vec: Optional[List[float]] = None):
+        """
+        search_documents cho event loop: embedding và Qdrant search dùng client async,
+        phần tính toán trong RAM (index cục bộ, rerank) chạy trên search_pool.
+        """
+        query_embedding = list(q_vec) if q_vec is not None else await self.aembed_query(query)
+
+        limit = max(top_k, RERANK_CANDIDATES) if self.reranker is not None else top_k
+        results = await self.run_search(self.document_index.search, self.qdrant_client, query_embedding, limit)
+        if results is None:
+            # Bản sao trong RAM chưa nạp xong, hoặc collection quá lớn để giữ trong RAM
+            results = await self.async_qdrant_client.search(
+                collection_name=self.documents_collection,
+                query_vector=query_embedding,
+                limit=limit,
+                search_params=DOCUMENT_SEARCH_PARAMS
+            )
+
+        if self.reranker is None:
+            return results[:top_k]
+        return await self.run_search(self.rerank_documents, query, results, top_k)
+
+    def search_training_qa(self, query: str, top_k: int = 5, q_vec: Optional[List[float]] = None):
         """
         Search training Q&A (Priority 1)
         
@@ -1218,21 +1433,18 @@ class TrainingService:
         Args:
             query: User question
             top_k: Số results (default 5)
+            q_vec: Embedding của query nếu đã tính sẵn (bỏ qua lần embed)
         
         Returns:
             List of search results with scores
         """
         
-        query_embedding = self.embeddings.embed_query(query)
+        query_embedding = list(q_vec) if q_vec is not None else self.embed_query(query)
         
-        results = self.qdrant_client.search(
-            collection_name=self.training_qa_collection,
-            query_vector=query_embedding,
-            limit=top_k
-        )
+        results = self.training_qa_search.search(self.qdrant_client, query_embedding, top_k)
         
         return results
-    def hybrid_search(self, query: str):
+    def hybrid_search(self, query: str, q_vec: Optional[List[float]] = None):
         """
         Hybrid RAG Search Strategy
         
@@ -1265,8 +1477,12 @@ class TrainingService:
             }
         """
         
+        # Embed một lần, dùng chung cho cả 2 collection
+        if q_vec is None:
+            q_vec = self.embed_query(query)
+
         # STEP 1: Search training Q&A
-        qa_results = self.search_training_qa(query, top_k=3)
+        qa_results = self.search_training_qa(query, top_k=3, q_vec=q_vec)
         
         # TIER 1: Perfect match (score > 0.7)
         if qa_results and qa_results[0].score > 0.7:
@@ -1283,7 +1499,7 @@ class TrainingService:
         
         
         # TIER 2: No training Q&A match, try documents
-        doc_results = self.search_documents(query, top_k=5)
+        doc_results = self.search_documents(query, top_k=5, q_vec=q_vec)
         if doc_results and len(doc_results) > 0: 
             return {
                     "response": doc_results,
@@ -1414,4 +1630,10 @@ class TrainingService:
 
     
 
-langchain_service = TrainingService()
+async def get_training_service(conn: HTTPConnection) -> TrainingService:
+    """
+    Dependency: the one TrainingService of the app, created in the lifespan (app.main),
+    so LLM/embedding/Qdrant clients and their connection pools are shared by every request.
+    Async so FastAPI resolves it on the event loop instead of a threadpool hop.
+    """
+    return conn.app.state.training_service
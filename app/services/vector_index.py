@@ -0,0 +1,136 @@
+import logging
+from threading import Lock, Thread
+import time
+from typing import List, Optional
+import numpy as np
+from qdrant_client.models import ScoredPoint
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    """
+    In-memory copy of a Qdrant collection for exact cosine top-k without a network round trip:
+    one contiguous (N, d) float32 matrix, L2-normalized row-wise, plus parallel ids/payloads.
+
+    The copy is built by a background thread (start_load(), also kicked off by the first
+    search() that finds it missing) and dropped by invalidate() when the collection changes.
+    Until it is ready, search() returns None and the caller queries Qdrant as before; a load
+    that was running when invalidate() came in is discarded and started again.
+    Collections larger than `max_points` are not copied (about 12 KB per 3072-d vector, so the
+    default caps the copy near 60 MB); Qdrant, with its int8 quantized vectors, serves those.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        max_points: int = 5_000,
+        batch_size: int = 512,
+        retry_after: float = 60,
+    ):
+        self.collection_name = collection_name
+        self.max_points = max_points
+        self.batch_size = batch_size
+        self.retry_after = retry_after
+        self._lock = Lock()
+        self._loaded = False
+        self._loading = False
+        self._generation = 0
+        self._failed_at = 0.0
+        self._mat: Optional[np.ndarray] = None
+        self._ids: list = []
+        self._payloads: list = []
+
+    def _read(self, qdrant_client):
+        """(mat, ids, payloads) of the whole collection; mat is None if it is too large to copy."""
+        count = qdrant_client.count(collection_name=self.collection_name, exact=True).count
+        if count > self.max_points:
+            return None, [], []
+        if count == 0:
+            return np.empty((0, 0), dtype=np.float32), [], []
+
+        ids, payloads, vectors = [], [], []
+        offset = None
+        while True:
+            points, offset = qdrant_client.scroll(
+                collection_name=self.collection_name,
+                limit=self.batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for p in points:
+                ids.append(p.id)
+                payloads.append(p.payload)
+                vectors.append(p.vector)
+            if offset is None:
+                break
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32), [], []
+        mat = np.asarray(vectors, dtype=np.float32)
+        mat /= np.maximum(np.linalg.norm(mat, axis=1, keepdims=True), 1e-12)
+        return mat, ids, payloads
+
+    def _load(self, qdrant_client, generation: int):
+        try:
+            mat, ids, payloads = self._read(qdrant_client)
+        except Exception as e:
+            logger.error("Error loading local index of %s: %s", self.collection_name, e)
+            with self._lock:
+                self._loading = False
+                self._failed_at = time.monotonic()
+            return
+        with self._lock:
+            self._loading = False
+            if generation != self._generation:
+                # invalidate() ran during the scroll: the next search starts a fresh load
+                return
+            self._mat, self._ids, self._payloads = mat, ids, payloads
+            self._loaded = True
+
+    def start_load(self, qdrant_client):
+        """Build the in-memory copy in a background thread unless it is loaded or loading."""
+        with self._lock:
+            if self._loaded or self._loading:
+                return
+            if time.monotonic() - self._failed_at < self.retry_after:
+                return
+            self._loading = True
+            generation = self._generation
+        Thread(
+            target=self._load, args=(qdrant_client, generation),
+            name=f"load-{self.collection_name}", daemon=True,
+        ).start()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._loaded = False
+            self._failed_at = 0.0
+            self._mat, self._ids, self._payloads = None, [], []
+
+    def search(self, qdrant_client, q_vec, top_k: int) -> Optional[List[ScoredPoint]]:
+        """Top-k points by cosine similarity, best first; None if the collection isn't held in memory."""
+        with self._lock:
+            loaded = self._loaded
+            mat, ids, payloads = self._mat, self._ids, self._payloads
+        if not loaded:
+            self.start_load(qdrant_client)
+            return None
+        if mat is None:
+            return None
+        if not ids:
+            return []
+
+        q = np.asarray(q_vec, dtype=np.float32)
+        if q.shape[0] != mat.shape[1]:
+            return None
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        scores = mat @ q
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            ScoredPoint(id=ids[i], version=0, score=float(scores[i]), payload=payloads[i])
+            for i in top
+        ]
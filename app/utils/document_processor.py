@@ -7,7 +7,42 @@ from pptx import Presentation
 from bs4 import BeautifulSoup
 import os
 import tempfile
+from enum import Enum
 from pathlib import Path
+from typing import Optional, Union
+
+# Nội dung file: bytes trong RAM, hoặc đường dẫn file đã lưu trên đĩa (không phải đọc cả file vào RAM)
+FileSource = Union[bytes, str, Path]
+
+# Số byte đầu file dùng để nhận dạng định dạng (magic bytes)
+SNIFF_SIZE = 4096
+
+
+class FileKind(str, Enum):
+    PDF = "pdf"
+    DOCX = "docx"
+    XLSX = "xlsx"
+    PPTX = "pptx"
+    HTML = "html"
+    TXT = "txt"
+    UNKNOWN = "unknown"
+
+
+# Office Open XML là file zip; .doc/.xls cũ là OLE compound file
+_ZIP_MAGIC = (b"PK\x03\x04",)
+_OLE_MAGIC = (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",)
+
+# extension → (kind, magic bytes hợp lệ ở offset 0; None = file text, không kiểm tra)
+_EXTENSION_KINDS = {
+    '.pdf': (FileKind.PDF, (b"%PDF-",)),
+    '.docx': (FileKind.DOCX, _ZIP_MAGIC),
+    '.doc': (FileKind.DOCX, _ZIP_MAGIC + _OLE_MAGIC),
+    '.xlsx': (FileKind.XLSX, _ZIP_MAGIC),
+    '.xls': (FileKind.XLSX, _ZIP_MAGIC + _OLE_MAGIC),
+    '.pptx': (FileKind.PPTX, _ZIP_MAGIC),
+    '.html': (FileKind.HTML, None),
+    '.txt': (FileKind.TXT, None),
+}
 
 class DocumentProcessor:
     """
@@ -59,9 +94,46 @@ class DocumentProcessor:
             return False, f"Invalid MIME type: {mime_type}"
         
         return True, ""
+
+    @staticmethod
+    def classify(head: bytes, filename: str) -> tuple[FileKind, str]:
+        """
+        Detect the file kind from its extension and the first SNIFF_SIZE bytes
+
+        Returns: (kind, error_message) - kind is FileKind.UNKNOWN when the content
+        does not match the extension
+        """
+        ext = Path(filename).suffix.lower()
+        kind, magics = _EXTENSION_KINDS.get(ext, (FileKind.UNKNOWN, None))
+        if kind is FileKind.UNKNOWN:
+            return kind, f"Unsupported file type: {ext}"
+        if magics is not None and not head.startswith(magics):
+            return FileKind.UNKNOWN, f"File content does not match {ext} format"
+        return kind, ""
     
     @staticmethod
-    def extract_text_from_pdf(file_content: bytes, filename: str) -> str:
+    def _open(file_content: FileSource):
+        """File-like/đường dẫn cho các thư viện parse: bytes → BytesIO, đường dẫn giữ nguyên."""
+        if isinstance(file_content, (bytes, bytearray)):
+            return io.BytesIO(file_content)
+        return str(file_content)
+
+    @staticmethod
+    def _read_bytes(file_content: FileSource) -> bytes:
+        if isinstance(file_content, (bytes, bytearray)):
+            return file_content
+        return Path(file_content).read_bytes()
+
+    @staticmethod
+    def _read_head(file_content: FileSource) -> bytes:
+        """SNIFF_SIZE byte đầu, không đọc cả file."""
+        if isinstance(file_content, (bytes, bytearray)):
+            return bytes(file_content[:SNIFF_SIZE])
+        with open(file_content, 'rb') as f:
+            return f.read(SNIFF_SIZE)
+
+    @staticmethod
+    def extract_text_from_pdf(file_content: FileSource, filename: str) -> str:
         """
         Extract text từ PDF
         
@@ -71,7 +143,7 @@ class DocumentProcessor:
         3. Preserve text structure (paragraphs, lists)
         
         Args:
-            file_content: Raw PDF bytes
+            file_content: Raw PDF bytes hoặc đường dẫn file PDF
             filename: Filename (for logging)
         
         Returns:
@@ -80,10 +152,16 @@ class DocumentProcessor:
         text = ""
         
         try:
-            # Write to temp file (pdfplumber cần file path)
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
-                tmp.write(file_content)
-                tmp_path = tmp.name
+            if isinstance(file_content, (bytes, bytearray)):
+                # Write to temp file (pdfplumber cần file path)
+                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+                    tmp.write(file_content)
+                    tmp_path = tmp.name
+                owns_tmp = True
+            else:
+                # File đã nằm trên đĩa → đọc thẳng, không tạo bản sao
+                tmp_path = str(file_content)
+                owns_tmp = False
             
             try:
                 # Try pdfplumber (best for Vietnamese)
@@ -97,7 +175,7 @@ class DocumentProcessor:
                 print(f"pdfplumber failed: {e}, trying PyPDF2...")
                 
                 # Fallback to PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+                pdf_reader = PyPDF2.PdfReader(DocumentProcessor._open(file_content))
                 for page_num, page in enumerate(pdf_reader.pages):
                     page_text = page.extract_text()
                     if page_text:
@@ -106,7 +184,8 @@ class DocumentProcessor:
             
             finally:
                 # Clean temp file
-                os.unlink(tmp_path)
+                if owns_tmp:
+                    os.unlink(tmp_path)
         
         except Exception as e:
             raise Exception(f"Failed to extract PDF: {str(e)}")
@@ -114,7 +193,7 @@ class DocumentProcessor:
         return text if text else "Unable to extract text from PDF"
     
     @staticmethod
-    def extract_text_from_docx(file_content: bytes) -> str:
+    def extract_text_from_docx(file_content: FileSource) -> str:
         """
         Extract text từ DOCX/DOC
         
@@ -135,7 +214,7 @@ class DocumentProcessor:
         
         try:
             import io
-            docx_file = DocxDocument(io.BytesIO(file_content))
+            docx_file = DocxDocument(DocumentProcessor._open(file_content))
             
             # Extract paragraphs
             for para in docx_file.paragraphs:
@@ -155,7 +234,7 @@ class DocumentProcessor:
         return text if text else "Unable to extract text from DOCX"
     
     @staticmethod
-    def extract_text_from_xlsx(file_content: bytes) -> str:
+    def extract_text_from_xlsx(file_content: FileSource) -> str:
         """
         Extract text từ Excel
         
@@ -174,7 +253,7 @@ class DocumentProcessor:
         
         try:
             import io
-            workbook = load_workbook(io.BytesIO(file_content))
+            workbook = load_workbook(DocumentProcessor._open(file_content))
             
             for sheet_name in workbook.sheetnames:
                 sheet = workbook[sheet_name]
@@ -194,7 +273,7 @@ class DocumentProcessor:
         return text if text else "Unable to extract text from XLSX"
     
     @staticmethod
-    def extract_text_from_pptx(file_content: bytes) -> str:
+    def extract_text_from_pptx(file_content: FileSource) -> str:
         """
         Extract text từ PowerPoint
         
@@ -213,7 +292,7 @@ class DocumentProcessor:
         
         try:
             import io
-            prs = Presentation(io.BytesIO(file_content))
+            prs = Presentation(DocumentProcessor._open(file_content))
             
             for slide_num, slide in enumerate(prs.slides):
                 text += f"\n--- SLIDE {slide_num + 1} ---\n"
@@ -236,7 +315,7 @@ class DocumentProcessor:
         return text if text else "Unable to extract text from PPTX"
     
     @staticmethod
-    def extract_text_from_html(file_content: bytes) -> str:
+    def extract_text_from_html(file_content: FileSource) -> str:
         """
         Extract text từ HTML
         
@@ -254,7 +333,7 @@ class DocumentProcessor:
         text = ""
         
         try:
-            html_str = file_content.decode('utf-8', errors='ignore')
+            html_str = DocumentProcessor._read_bytes(file_content).decode('utf-8', errors='ignore')
             soup = BeautifulSoup(html_str, 'html.parser')
             
             # Remove script and style
@@ -275,41 +354,46 @@ class DocumentProcessor:
         return text if text else "Unable to extract text from HTML"
     
     @staticmethod
-    def extract_text(file_content: bytes, filename: str, mime_type: str) -> str:
+    def extract_text_from_txt(file_content: FileSource) -> str:
+        return DocumentProcessor._read_bytes(file_content).decode('utf-8', errors='ignore')
+
+    @staticmethod
+    def extract_text(
+        file_content: FileSource,
+        filename: str,
+        mime_type: str,
+        kind: Optional[FileKind] = None
+    ) -> str:
         """
         Main extraction function - route to specific handler
         
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes hoặc đường dẫn file đã lưu
             filename: Filename
             mime_type: MIME type
+            kind: FileKind từ classify() nếu caller đã validate/nhận dạng file
         
         Returns:
             Extracted text (cleaned)
         """
         
-        # Validate
-        is_valid, error_msg = DocumentProcessor.validate_file(filename, mime_type)
-        if not is_valid:
-            raise ValueError(error_msg)
-        
-        ext = Path(filename).suffix.lower()
+        if kind is None:
+            # Validate
+            is_valid, error_msg = DocumentProcessor.validate_file(filename, mime_type)
+            if not is_valid:
+                raise ValueError(error_msg)
+            head = DocumentProcessor._read_head(file_content)
+            kind, error_msg = DocumentProcessor.classify(head, filename)
+            if kind is FileKind.UNKNOWN:
+                raise ValueError(error_msg)
         
         # Route to appropriate handler
-        if ext == '.pdf':
+        if kind is FileKind.PDF:
             text = DocumentProcessor.extract_text_from_pdf(file_content, filename)
-        elif ext in ['.docx', '.doc']:
-            text = DocumentProcessor.extract_text_from_docx(file_content)
-        elif ext in ['.xlsx', '.xls']:
-            text = DocumentProcessor.extract_text_from_xlsx(file_content)
-        elif ext == '.pptx':
-            text = DocumentProcessor.extract_text_from_pptx(file_content)
-        elif ext == '.html':
-            text = DocumentProcessor.extract_text_from_html(file_content)
-        elif ext == '.txt':
-            text = file_content.decode('utf-8', errors='ignore')
+        elif kind in _EXTRACTORS:
+            text = _EXTRACTORS[kind](file_content)
         else:
-            raise ValueError(f"Unsupported file type: {ext}")
+            raise ValueError(f"Unsupported file type: {Path(filename).suffix.lower()}")
         
         # Clean text
         text = DocumentProcessor.clean_text(text)
@@ -349,4 +433,13 @@ class DocumentProcessor:
         
         return text
 
+# PDF cần thêm filename nên gọi riêng trong extract_text
+_EXTRACTORS = {
+    FileKind.DOCX: DocumentProcessor.extract_text_from_docx,
+    FileKind.XLSX: DocumentProcessor.extract_text_from_xlsx,
+    FileKind.PPTX: DocumentProcessor.extract_text_from_pptx,
+    FileKind.HTML: DocumentProcessor.extract_text_from_html,
+    FileKind.TXT: DocumentProcessor.extract_text_from_txt,
+}
+
 documentProcessor = DocumentProcessor()
\ No newline at end of file
@@ -5,5 +5,8 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=True,
+        # Ping ở tầng giao thức websocket: client mất kết nối mà không đóng sẽ bị phát hiện sau ~40s
+        ws_ping_interval=20,
+        ws_ping_timeout=20
     )
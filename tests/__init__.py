@@ -8,5 +8,9 @@ import os
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import all fixtures from test_config
-from tests.test_config import *
+# Import all fixtures from test_config (not present in every checkout)
+try:
+    from tests.test_config import *
+except ModuleNotFoundError as e:
+    if e.name != "tests.test_config":
+        raise
@@ -0,0 +1,88 @@
+import threading
+
+from app.services.search_batcher import SearchBatcher
+
+
+class FakeQdrant:
+    """Records every search_batch call; each request's result is tagged with its own vector."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def search_batch(self, collection_name, requests):
+        with self._lock:
+            self.batches.append(list(requests))
+        if self.error is not None:
+            raise self.error
+        return [[("hit", r.vector[0], r.limit)] for r in requests]
+
+
+def run_concurrently(batcher, client, n):
+    """n threads call batcher.search at once; returns {i: result or exception}."""
+    results = {}
+    start = threading.Barrier(n)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = batcher.search(client, [float(i), 0.0], i + 1)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    assert not any(t.is_alive() for t in threads), "a waiter never completed"
+    return results
+
+
+def test_concurrent_callers_get_their_own_results():
+    client = FakeQdrant()
+    batcher = SearchBatcher("docs", window_ms=50, max_batch=32)
+
+    results = run_concurrently(batcher, client, 8)
+
+    assert results == {i: [("hit", float(i), i + 1)] for i in range(8)}
+    # Cùng một đợt → ít request search_batch hơn số lượt gọi
+    assert len(client.batches) < 8
+    assert sum(len(b) for b in client.batches) == 8
+
+
+def test_more_than_max_batch_waiters_all_complete():
+    client = FakeQdrant()
+    batcher = SearchBatcher("docs", window_ms=50, max_batch=3)
+
+    results = run_concurrently(batcher, client, 10)
+
+    assert results == {i: [("hit", float(i), i + 1)] for i in range(10)}
+    assert all(len(b) <= 3 for b in client.batches)
+    assert sum(len(b) for b in client.batches) == 10
+
+
+def test_search_batch_error_reaches_every_waiter():
+    error = RuntimeError("qdrant down")
+    client = FakeQdrant(error=error)
+    batcher = SearchBatcher("docs", window_ms=50, max_batch=4)
+
+    results = run_concurrently(batcher, client, 6)
+
+    assert len(results) == 6
+    assert all(r is error for r in results.values())
+
+    # Lỗi không làm kẹt batcher: đợt sau vẫn chạy bình thường
+    client.error = None
+    assert batcher.search(client, [1.0], 2) == [("hit", 1.0, 2)]
+
+
+def test_zero_window_searches_directly():
+    class DirectQdrant:
+        def search(self, collection_name, query_vector, limit, search_params=None):
+            return [("direct", collection_name, limit)]
+
+    batcher = SearchBatcher("docs", window_ms=0)
+    assert batcher.search(DirectQdrant(), [1.0], 3) == [("direct", "docs", 3)]
+
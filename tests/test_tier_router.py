@@ -0,0 +1,59 @@
+from app.services.tier_router import MIN_DOCUMENT_CONFIDENCE, route_tier
+
+HIGH = MIN_DOCUMENT_CONFIDENCE + 0.1
+LOW = MIN_DOCUMENT_CONFIDENCE - 0.1
+TUITION_CONTEXT = "Học phí ngành Công nghệ thông tin năm 2025 là 30 triệu đồng/học kỳ."
+
+
+def test_recommendation_phrase_routes_to_recommendation():
+    assert route_tier("Em nên học ngành gì?", "", 0.0) == "recommendation"
+    assert route_tier("tu van cho em voi, em thich ve", "", 0.0) == "recommendation"
+
+
+def test_document_topic_found_in_context_routes_to_document():
+    assert route_tier("Học phí ngành CNTT bao nhiêu?", TUITION_CONTEXT, HIGH) == "document"
+    assert route_tier("hoc phi nganh cntt bao nhieu", TUITION_CONTEXT, HIGH) == "document"
+
+
+def test_decomposed_unicode_query_still_matches():
+    import unicodedata
+    query = unicodedata.normalize("NFD", "Học phí ngành CNTT bao nhiêu?")
+    assert route_tier(query, TUITION_CONTEXT, HIGH) == "document"
+
+
+def test_document_topic_needs_confidence():
+    assert route_tier("Học phí ngành CNTT bao nhiêu?", TUITION_CONTEXT, LOW) is None
+
+
+def test_document_topic_missing_from_context_is_left_to_llm():
+    assert route_tier("Học phí ngành CNTT bao nhiêu?", "Ký túc xá có 500 phòng.", HIGH) is None
+    # Mọi chủ đề trong câu hỏi phải có trong context
+    assert route_tier("Học phí và học bổng ngành CNTT?", TUITION_CONTEXT, HIGH) is None
+
+
+def test_both_kinds_of_phrases_are_left_to_llm():
+    assert route_tier("Em nên học ngành gì, học phí bao nhiêu?", TUITION_CONTEXT, HIGH) is None
+
+
+def test_no_phrase_is_left_to_llm():
+    assert route_tier("Trường có câu lạc bộ bóng đá không?", TUITION_CONTEXT, HIGH) is None
+    assert route_tier("", TUITION_CONTEXT, HIGH) is None
+
+
+def test_phrases_match_on_word_boundaries_only():
+    # "hoc phi" nằm giữa từ khác không được tính
+    assert route_tier("xhoc phix", "xhoc phix", HIGH) is None
+    assert route_tier("riasecs", "", 0.0) is None
+
+
+def test_accented_chi_tieu_is_quota_not_spending():
+    quota_context = "Chỉ tiêu tuyển sinh ngành CNTT năm nay là 300."
+    assert route_tier("Chỉ tiêu ngành CNTT là bao nhiêu?", quota_context, HIGH) == "document"
+    spending_context = "Sinh viên nên lập kế hoạch chi tiêu hàng tháng."
+    assert route_tier("Chi tiêu hàng tháng của sinh viên khoảng bao nhiêu?", spending_context, HIGH) is None
+
+
+def test_unaccented_chi_tieu_is_left_to_llm():
+    context = "Chỉ tiêu tuyển sinh ngành CNTT năm nay là 300. Chi tiêu sinh hoạt khoảng 4 triệu."
+    assert route_tier("chi tieu nganh cntt bao nhieu", context, HIGH) is None
+    assert route_tier("tu van cho em chi tieu hang thang", "", 0.0) is None